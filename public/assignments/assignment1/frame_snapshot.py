@@ -0,0 +1,209 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Binary Snapshot Format for Gaussian Animation Frames
+==============================================================
+
+A compact, versioned binary record of everything one animation frame shows:
+the histogram, the CDF grid, the Q-Q quantiles and the statistics. Every
+record has the same fixed size - a 24-byte header followed by contiguous
+little-endian float32 arrays - so a file of frames is simply the records
+back to back, and any consumer can read it without Python dicts or text
+parsing:
+
+    NumPy:   np.frombuffer(data, SNAPSHOT_DTYPE) or load_snapshots(path)
+    Other:   read SNAPSHOT_DTYPE.itemsize bytes per frame; field offsets are
+             listed by snapshot_layout()
+
+Record layout (version 1, little-endian):
+    magic           4 bytes   b'WCSN'
+    version         uint16
+    hist_bins       uint16    valid histogram bins (rest is NaN)
+    frame           uint32    frame index
+    qq_points       uint16    valid Q-Q points (rest is NaN)
+    reserved        uint16
+    n               uint64    sample count
+    stats           float32[10]   STATS_FIELDS, in that order
+    qq_fit          float32[3]    Q-Q slope, intercept and R²
+    hist_edges      float32[MAX_HIST_BINS + 1]
+    hist_counts     float32[MAX_HIST_BINS]
+    cdf_x, cdf_empirical, cdf_theory      float32[CURVE_POINTS] each
+    qq_theoretical, qq_sample             float32[QQ_POINTS] each
+
+Records are filled in place (NumPy casts straight into the record buffer)
+and decoded as views of the buffer, so neither direction copies the arrays.
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+Assignment: 1 - Gaussian Random Variable Distribution (frame export)
+"""
+
+import numpy as np
+
+from gaussian_animation import (MAX_HIST_BINS, CURVE_POINTS, QQ_POINTS, curve_support,
+                                theory_curves)
+
+# =============================================================================
+# FORMAT
+# =============================================================================
+
+SNAPSHOT_MAGIC = b'WCSN'
+SNAPSHOT_VERSION = 1        # Bump when the record layout changes
+
+STATS_FIELDS = ('n', 'emp_mean', 'emp_var', 'emp_std', 'mean_error', 'var_error',
+                'ks_stat', 'ks_pvalue', 'snr_db', 'papr_db')
+
+SNAPSHOT_DTYPE = np.dtype([
+    ('magic', 'S4'),
+    ('version', '<u2'),
+    ('hist_bins', '<u2'),
+    ('frame', '<u4'),
+    ('qq_points', '<u2'),
+    ('reserved', '<u2'),
+    ('n', '<u8'),
+    ('stats', '<f4', (len(STATS_FIELDS),)),
+    ('qq_fit', '<f4', (3,)),
+    ('hist_edges', '<f4', (MAX_HIST_BINS + 1,)),
+    ('hist_counts', '<f4', (MAX_HIST_BINS,)),
+    ('cdf_x', '<f4', (CURVE_POINTS,)),
+    ('cdf_empirical', '<f4', (CURVE_POINTS,)),
+    ('cdf_theory', '<f4', (CURVE_POINTS,)),
+    ('qq_theoretical', '<f4', (QQ_POINTS,)),
+    ('qq_sample', '<f4', (QQ_POINTS,)),
+])
+
+def snapshot_layout():
+    """
+    (field, byte offset, byte size) of every field of a record, for readers
+    outside NumPy.
+    """
+    return [(name, SNAPSHOT_DTYPE.fields[name][1], SNAPSHOT_DTYPE.fields[name][0].itemsize)
+            for name in SNAPSHOT_DTYPE.names]
+
+# =============================================================================
+# ENCODING
+# =============================================================================
+
+def fill_snapshot(record, frame, data, frame_stats):
+    """
+    Writes one frame (compute_frame_data dict and calculate_statistics dict)
+    into a record of a SNAPSHOT_DTYPE array, in place.
+    """
+    bins = int(data['hist_bins'])
+    edges = data['hist_edges']
+
+    record['magic'] = SNAPSHOT_MAGIC
+    record['version'] = SNAPSHOT_VERSION
+    record['hist_bins'] = bins
+    record['frame'] = frame
+    record['qq_points'] = int(data['qq_points'])
+    record['n'] = int(frame_stats['n'])
+    record['stats'] = [frame_stats[name] for name in STATS_FIELDS]
+    record['qq_fit'] = (data['qq_slope'], data['qq_intercept'], data['r_squared'])
+    record['hist_edges'] = edges
+    counts = record['hist_counts']
+    counts[:] = np.nan
+    counts[:bins] = data['hist_density'][:bins] * np.diff(edges[:bins + 1]) * frame_stats['n']
+    for name in ('cdf_x', 'cdf_empirical', 'cdf_theory', 'qq_theoretical', 'qq_sample'):
+        record[name] = data[name]
+
+def encode_snapshot(frame, data, frame_stats):
+    """
+    One frame as a standalone record; returns a memoryview of its bytes.
+    """
+    buffer = np.zeros(1, dtype=SNAPSHOT_DTYPE)
+    fill_snapshot(buffer[0], frame, data, frame_stats)
+    return memoryview(buffer).cast('B')
+
+# =============================================================================
+# DECODING
+# =============================================================================
+
+def decode_snapshots(buffer):
+    """
+    Array of records viewing a bytes-like buffer (no copy).
+    Raises ValueError if the buffer is not a whole number of version-1 records.
+    """
+    if len(memoryview(buffer).cast('B')) % SNAPSHOT_DTYPE.itemsize:
+        raise ValueError(f"Snapshot buffer is not a multiple of {SNAPSHOT_DTYPE.itemsize} bytes")
+    records = np.frombuffer(buffer, dtype=SNAPSHOT_DTYPE)
+    _check_records(records)
+    return records
+
+def load_snapshots(path):
+    """
+    Memory-maps a snapshot file; frames are read from disk on access.
+    """
+    records = np.memmap(path, dtype=SNAPSHOT_DTYPE, mode='r')
+    _check_records(records)
+    return records
+
+def _check_records(records):
+    if len(records) and (np.any(records['magic'] != SNAPSHOT_MAGIC)
+                         or np.any(records['version'] != SNAPSHOT_VERSION)):
+        raise ValueError(f"Not a version {SNAPSHOT_VERSION} WCOM frame snapshot")
+
+def snapshot_stats(record):
+    """
+    The calculate_statistics dict stored in a record.
+    """
+    frame_stats = dict(zip(STATS_FIELDS, record['stats'].tolist()))
+    frame_stats['n'] = int(record['n'])
+    return frame_stats
+
+def snapshot_frame_data(record, mu, sigma):
+    """
+    Rebuilds the compute_frame_data dict of a record for the drawing
+    functions. The PDF curve comes from the cached theoretical curves on the
+    support of the histogram edges; the KDE curve is not stored.
+    """
+    bins = int(record['hist_bins'])
+    edges = record['hist_edges']
+    hist_density = np.full(MAX_HIST_BINS, np.nan)
+    hist_density[:bins] = record['hist_counts'][:bins] / (np.diff(edges[:bins + 1]) * record['n'])
+    pdf_x, theory_pdf, _ = theory_curves(mu, sigma,
+                                         curve_support(edges[0], edges[bins], mu, sigma))
+
+    return {
+        'hist_bins': bins,
+        'hist_density': hist_density,
+        'hist_edges': edges,
+        'pdf_x': pdf_x,
+        'theory_pdf': theory_pdf,
+        'kde_pdf': np.full(CURVE_POINTS, np.nan),
+        'qq_points': int(record['qq_points']),
+        'qq_theoretical': record['qq_theoretical'],
+        'qq_sample': record['qq_sample'],
+        'qq_slope': float(record['qq_fit'][0]),
+        'qq_intercept': float(record['qq_fit'][1]),
+        'r_squared': float(record['qq_fit'][2]),
+        'cdf_x': record['cdf_x'],
+        'cdf_empirical': record['cdf_empirical'],
+        'cdf_theory': record['cdf_theory'],
+    }
+
+# =============================================================================
+# DEMONSTRATION
+# =============================================================================
+
+if __name__ == "__main__":
+    from gaussian_animation import run_session, session_config
+
+    print("=" * 60)
+    print("WCOM Lab - Binary Frame Snapshots")
+    print("=" * 60)
+
+    config = session_config()
+    session = run_session(config, keep_frames=True)
+    num_frames = len(session['stats'])
+
+    records = np.zeros(num_frames, dtype=SNAPSHOT_DTYPE)
+    for frame in range(num_frames):
+        data = {name: column[frame] for name, column in session['frames'].items()}
+        fill_snapshot(records[frame], frame, data, session['stats'][frame])
+
+    decoded = decode_snapshots(records.tobytes())
+    last = snapshot_stats(decoded[-1])
+    print(f"Record size: {SNAPSHOT_DTYPE.itemsize} bytes | {num_frames} frames: "
+          f"{decoded.nbytes / 1024:.1f} KiB")
+    print(f"Last frame: n = {last['n']}, KS = {last['ks_stat']:.4f}, "
+          f"histogram total = {np.nansum(decoded[-1]['hist_counts']):.0f}")
@@ -12,12 +12,18 @@ Course: Wireless Communication Laboratory
 Assignment: 1 - Gaussian Random Variable Distribution with Animation
 """
 
+import time
+from functools import lru_cache
+
 import numpy as np
 import scipy.stats as stats
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import matplotlib.patches as patches
 
+from goodness_of_fit import gof_statistics
+from signal_metrics import signal_metrics
+
 # =============================================================================
 # USER-CONFIGURABLE PARAMETERS
 # =============================================================================
@@ -31,99 +37,259 @@ initial_sample_size = 50    # Initial number of samples
 max_sample_size = 2000      # Maximum number of samples
 batch_size = 25             # Number of samples to add in each animation step
 random_seed = 42            # Random seed for reproducibility
+quantile_backend = 'exact'  # 'exact' (sorted samples) or 'kll' (quantile sketch, O(1) memory)
+gof_tests = False           # Add the AD, CvM, Shapiro-Wilk and χ² tests to every frame (exact backend)
 
 # Animation settings
 animation_interval = 300    # Milliseconds between frames
 save_animation = False      # Set to True to save animation as GIF/MP4
+export_snapshots = False    # With save_animation, also write every frame as a binary snapshot
+
+# Result storage (see run_store.py)
+store_results = False       # Set to True to store/reuse per-frame statistics
+store_samples = False       # Also store the raw samples of the run
+replay = False              # Set to True to draw a stored run without recomputation
 
 # =============================================================================
-# INITIALIZATION
+# SAMPLE GENERATION
 # =============================================================================
 
-print("=" * 60)
-print("WCOM Lab - Gaussian Distribution Animation")
-print("=" * 60)
-print(f"Parameters: μ={mu}, σ={sigma}")
-print(f"Sample progression: {initial_sample_size} → {max_sample_size} (batch: {batch_size})")
-print("=" * 60)
+def generate_samples(size, mu, sigma, rng=None):
+    """
+    Draws Gaussian samples N(mu, sigma^2). This is the sampling layer shared by
+    the animation and the WCOM simulators (e.g. log-normal shadowing in dB).
+    Uses the global NumPy seed unless a np.random.Generator is passed.
+    """
+    if rng is None:
+        return np.random.normal(loc=mu, scale=sigma, size=size)
+    return rng.normal(loc=mu, scale=sigma, size=size)
+
+def empirical_cdf(samples):
+    """
+    Returns (sorted_samples, cumulative probabilities) of the empirical CDF.
+    """
+    sorted_samples = np.sort(samples, axis=None)
+    y_empirical = np.arange(1, len(sorted_samples) + 1) / len(sorted_samples)
+    return sorted_samples, y_empirical
+
+# =============================================================================
+# FRAME PLAN
+# =============================================================================
 
-# Initialize random number generator
-np.random.seed(random_seed)
+# Milestone annotations: (fraction of max_sample_size reached, text, y position, color).
+# The starting annotation (fraction None) is shown on the first frame.
+MILESTONES = [
+    (None, "Starting: Small sample, high variability", 0.98, 'yellow'),
+    (0.25, "25% complete: Shape emerging", 0.90, 'orange'),
+    (0.75, "75% complete: Converging to theory", 0.82, 'lightgreen'),
+    (1.00, "Complete: Law of Large Numbers demonstrated!", 0.74, 'lightblue'),
+]
 
-# Generate initial samples
-samples = np.random.normal(loc=mu, scale=sigma, size=initial_sample_size)
+def build_frame_plan(initial_sample_size, max_sample_size, batch_size, milestones=MILESTONES):
+    """
+    Frame schedule of a session, built once up front: the sample count after
+    every frame, the batch each frame adds and the milestone annotations
+    (taken from a table laid out like MILESTONES).
+    Frame i always shows the first n[i] samples of the session's sample
+    stream, so frames are independent of each other (they can be computed
+    ahead, in any order or in parallel) and every milestone lands on exactly
+    one frame whatever the batch size.
+    """
+    n = np.arange(initial_sample_size + batch_size, max_sample_size + batch_size, batch_size)
+    n = np.minimum(n, max_sample_size)
+    num_frames = len(n)
+
+    schedule = {}
+    for fraction, text, y, color in milestones:
+        if num_frames == 0:
+            break
+        if fraction is None:
+            frame = 0
+        else:
+            frame = min(int(np.searchsorted(n, fraction * max_sample_size)), num_frames - 1)
+        schedule.setdefault(frame, []).append((text, y, color))
 
-print(f"Initial samples generated: {len(samples)}")
-print(f"Initial sample statistics:")
-print(f"  Mean: {np.mean(samples):.4f} (theoretical: {mu})")
-print(f"  Std:  {np.std(samples, ddof=1):.4f} (theoretical: {sigma})")
+    return {
+        'num_frames': num_frames,
+        'n': n,
+        'batch_start': np.concatenate(([initial_sample_size], n[:-1]))[:num_frames],
+        'batch_stop': n,
+        'milestones': schedule,
+        'max_sample_size': max_sample_size,
+    }
 
 # =============================================================================
-# FIGURE AND SUBPLOT SETUP
+# FRAME DATA
 # =============================================================================
+# Everything a frame draws is first reduced to fixed-size arrays, so frames can
+# be recorded in the run store and replayed later without the samples.
 
-# Create figure with enhanced styling for WCOM lab
-plt.style.use('default')
-fig = plt.figure(figsize=(15, 10))
-fig.suptitle('WCOM Lab: Gaussian Distribution Learning Animation\n' + 
-             f'μ={mu}, σ={sigma} | Wireless Communication Applications', 
-             fontsize=16, fontweight='bold', y=0.95)
+MAX_HIST_BINS = 50          # Histogram bins (fewer for small samples, NaN-padded)
+CURVE_POINTS = 200          # Points of the PDF/KDE and CDF curves
+QQ_POINTS = 200             # Q-Q quantiles drawn per frame
+SUPPORT_SIGMAS = 5          # Half-width (in σ) of the fixed support of the theoretical curves
+CURVE_CACHE_SIZE = 32       # Theoretical curve sets kept in the LRU cache
 
-# Create 2x2 grid of subplots with custom spacing
-gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3, 
-                      left=0.08, right=0.95, top=0.85, bottom=0.25)
+def curve_support(lo, hi, mu, sigma):
+    """
+    Half-width (in σ) of the support on which data spanning [lo, hi] is drawn:
+    SUPPORT_SIGMAS, widened in whole σ only when the data leaves it. The
+    support (and so the x-axis limits) therefore stays put from frame to frame.
+    """
+    reach = max(mu - lo, hi - mu) / sigma
+    return max(SUPPORT_SIGMAS, int(np.ceil(reach + 0.5)))
 
-ax_hist = fig.add_subplot(gs[0, 0])
-ax_time = fig.add_subplot(gs[0, 1])
-ax_qq = fig.add_subplot(gs[1, 0])
-ax_cdf = fig.add_subplot(gs[1, 1])
+@lru_cache(maxsize=CURVE_CACHE_SIZE)
+def theory_curves(mu, sigma, half_width=SUPPORT_SIGMAS):
+    """
+    Grid, theoretical PDF and theoretical CDF of N(mu, sigma²) on the fixed
+    support mu ± half_width·σ. Computed once per (mu, sigma, support) and
+    shared by every frame and session, so the arrays are read-only.
+    """
+    x = np.linspace(mu - half_width*sigma, mu + half_width*sigma, CURVE_POINTS)
+    curves = (x, stats.norm.pdf(x, mu, sigma), stats.norm.cdf(x, mu, sigma))
+    for curve in curves:
+        curve.flags.writeable = False
+    return curves
 
-axes = [ax_hist, ax_time, ax_qq, ax_cdf]
+def histogram_bin_count(n):
+    """
+    Number of histogram bins for n samples (one per 10 samples, at most
+    MAX_HIST_BINS). Shared by every histogram of the toolkit.
+    """
+    return max(1, min(MAX_HIST_BINS, n//10))
+
+def histogram_bins(samples):
+    """
+    Histogram density of the samples, NaN-padded to MAX_HIST_BINS (no curves).
+    """
+    bins = histogram_bin_count(len(samples))
+    density, edges = np.histogram(samples, bins=bins, density=True)
 
-# Set initial titles with WCOM context
-ax_hist.set_title("Signal Amplitude Distribution\n(Histogram vs Theoretical PDF)", fontsize=12)
-ax_time.set_title("Signal Samples Over Time\n(Time Series)", fontsize=12)
-ax_qq.set_title("Normality Check\n(Q-Q Plot)", fontsize=12)
-ax_cdf.set_title("Cumulative Distribution\n(Empirical vs Theoretical CDF)", fontsize=12)
+    hist_density = np.full(MAX_HIST_BINS, np.nan)
+    hist_edges = np.full(MAX_HIST_BINS + 1, np.nan)
+    hist_density[:bins] = density
+    hist_edges[:bins + 1] = edges
+    return {
+        'hist_bins': bins,
+        'hist_density': hist_density,
+        'hist_edges': hist_edges,
+    }
+
+def histogram_data(samples, mu, sigma):
+    """
+    Histogram density, theoretical PDF and KDE of the samples.
+    """
+    data = histogram_bins(samples)
+    edges = data['hist_edges'][:data['hist_bins'] + 1]
+
+    # Theoretical PDF on the cached fixed support
+    x_range, theory_pdf, _ = theory_curves(mu, sigma, curve_support(edges[0], edges[-1], mu, sigma))
+
+    # Smoothed empirical distribution (KDE)
+    kde_pdf = np.full(CURVE_POINTS, np.nan)
+    if len(samples) > 10:
+        try:
+            kde_pdf = stats.gaussian_kde(samples)(x_range)
+        except Exception:
+            pass
+
+    data.update({
+        'pdf_x': x_range,
+        'theory_pdf': theory_pdf,
+        'kde_pdf': kde_pdf,
+    })
+    return data
+
+def qq_data(samples, mu, sigma):
+    """
+    Q-Q quantiles (at most QQ_POINTS of them), fit line and R².
+    """
+    (osm, osr), (slope, intercept, _) = stats.probplot(samples, dist="norm", sparams=(mu, sigma))
+    keep = np.unique(np.linspace(0, len(osm) - 1, min(len(osm), QQ_POINTS)).astype(int))
+
+    qq_theoretical = np.full(QQ_POINTS, np.nan)
+    qq_sample = np.full(QQ_POINTS, np.nan)
+    qq_theoretical[:len(keep)] = osm[keep]
+    qq_sample[:len(keep)] = osr[keep]
+
+    # R² correlation coefficient
+    theoretical_quantiles = stats.norm.ppf(np.linspace(0.01, 0.99, len(samples)), mu, sigma)
+    r_squared = np.corrcoef(theoretical_quantiles, osr)[0, 1]**2
+
+    return {
+        'qq_points': len(keep),
+        'qq_theoretical': qq_theoretical,
+        'qq_sample': qq_sample,
+        'qq_slope': slope,
+        'qq_intercept': intercept,
+        'r_squared': r_squared,
+    }
+
+def cdf_data(samples, mu, sigma):
+    """
+    Empirical and theoretical CDF on the cached CURVE_POINTS grid of the
+    fixed support.
+    """
+    sorted_samples, y_empirical = empirical_cdf(samples)
+    half_width = curve_support(sorted_samples[0], sorted_samples[-1], mu, sigma)
+    x_range, _, theory_cdf = theory_curves(mu, sigma, half_width)
+    pos = np.searchsorted(sorted_samples, x_range, side='right')
+    return {
+        'cdf_x': x_range,
+        'cdf_empirical': pos / len(sorted_samples),
+        'cdf_theory': theory_cdf,
+    }
+
+def compute_frame_data(samples, mu, sigma):
+    """
+    All drawing data of one frame (histogram, Q-Q and CDF panels).
+    """
+    data = histogram_data(samples, mu, sigma)
+    data.update(qq_data(samples, mu, sigma))
+    data.update(cdf_data(samples, mu, sigma))
+    return data
 
 # =============================================================================
 # PLOTTING FUNCTIONS
 # =============================================================================
 
-def plot_histogram(samples, ax, mu, sigma):
+def draw_histogram(data, ax):
     """
-    Plots histogram with theoretical PDF and smoothed empirical distribution.
+    Draws histogram with theoretical PDF and smoothed empirical distribution.
     Relevant for analyzing signal amplitude distributions in wireless systems.
     """
     ax.clear()
     
-    # Plot histogram
-    n, bins, patches = ax.hist(samples, bins=min(50, len(samples)//10), 
-                              density=True, alpha=0.7, color='skyblue', 
-                              edgecolor='navy', linewidth=0.5,
-                              label='Empirical Histogram')
+    # Plot histogram from the precomputed densities
+    bins = int(data['hist_bins'])
+    edges = data['hist_edges'][:bins + 1]
+    ax.hist(edges[:-1], bins=edges, weights=data['hist_density'][:bins],
+            alpha=0.7, color='skyblue', edgecolor='navy', linewidth=0.5,
+            label='Empirical Histogram')
     
     # Theoretical PDF
-    x_range = np.linspace(samples.min() - 0.5*sigma, samples.max() + 0.5*sigma, 200)
-    theoretical_pdf = stats.norm.pdf(x_range, mu, sigma)
-    ax.plot(x_range, theoretical_pdf, 'r-', linewidth=3, 
+    ax.plot(data['pdf_x'], data['theory_pdf'], 'r-', linewidth=3, 
             label='Theoretical PDF', alpha=0.9)
     
     # Smoothed empirical distribution (KDE)
-    if len(samples) > 10:
-        try:
-            kde = stats.gaussian_kde(samples)
-            ax.plot(x_range, kde(x_range), 'g--', linewidth=2, 
-                   label='Smoothed Empirical', alpha=0.8)
-        except:
-            pass
+    if not np.all(np.isnan(data['kde_pdf'])):
+        ax.plot(data['pdf_x'], data['kde_pdf'], 'g--', linewidth=2, 
+               label='Smoothed Empirical', alpha=0.8)
     
+    ax.set_xlim(data['pdf_x'][0], data['pdf_x'][-1])  # Changes only with the support
     ax.set_title("Signal Amplitude Distribution\n(Histogram vs Theoretical PDF)", fontsize=12)
     ax.set_xlabel("Signal Amplitude")
     ax.set_ylabel("Probability Density")
     ax.legend(loc='upper right', fontsize=10)
     ax.grid(True, alpha=0.3)
 
+def plot_histogram(samples, ax, mu, sigma):
+    """
+    Plots histogram with theoretical PDF and smoothed empirical distribution.
+    """
+    draw_histogram(histogram_data(samples, mu, sigma), ax)
+
 def plot_time_series(samples, ax):
     """
     Plots samples as time series - relevant for signal analysis over time.
@@ -158,24 +324,19 @@ def plot_time_series(samples, ax):
     ax.legend(loc='upper right', fontsize=10)
     ax.grid(True, alpha=0.3)
 
-def plot_qq(samples, ax, mu, sigma):
+def draw_qq(data, ax):
     """
     Q-Q plot for normality testing - important for validating Gaussian assumptions
     in wireless channel modeling.
     """
     ax.clear()
     
-    # Generate Q-Q plot
-    stats.probplot(samples, dist="norm", sparams=(mu, sigma), plot=ax)
-    
-    # Enhance the plot
-    ax.get_lines()[0].set_markerfacecolor('blue')
-    ax.get_lines()[0].set_markeredgecolor('darkblue')
-    ax.get_lines()[0].set_markersize(4)
-    ax.get_lines()[0].set_alpha(0.7)
-    
-    ax.get_lines()[1].set_color('red')
-    ax.get_lines()[1].set_linewidth(2)
+    # Sample quantiles against theoretical quantiles, with the least-squares fit
+    points = int(data['qq_points'])
+    osm = data['qq_theoretical'][:points]
+    ax.plot(osm, data['qq_sample'][:points], 'o', markerfacecolor='blue',
+            markeredgecolor='darkblue', markersize=4, alpha=0.7)
+    ax.plot(osm, data['qq_slope'] * osm + data['qq_intercept'], 'r-', linewidth=2)
     
     ax.set_title("Normality Check\n(Q-Q Plot)", fontsize=12)
     ax.set_xlabel("Theoretical Quantiles")
@@ -183,32 +344,31 @@ def plot_qq(samples, ax, mu, sigma):
     ax.grid(True, alpha=0.3)
     
     # Add R² correlation coefficient
-    theoretical_quantiles = stats.norm.ppf(np.linspace(0.01, 0.99, len(samples)), mu, sigma)
-    sample_quantiles = np.sort(samples)
-    if len(theoretical_quantiles) == len(sample_quantiles):
-        r_squared = np.corrcoef(theoretical_quantiles, sample_quantiles)[0, 1]**2
-        ax.text(0.05, 0.95, f'R² = {r_squared:.4f}', transform=ax.transAxes,
-               bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
-               fontsize=10)
+    ax.text(0.05, 0.95, f'R² = {data["r_squared"]:.4f}', transform=ax.transAxes,
+           bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8),
+           fontsize=10)
 
-def plot_cdf(samples, ax, mu, sigma):
+def plot_qq(samples, ax, mu, sigma):
+    """
+    Q-Q plot of the samples against N(mu, sigma^2).
+    """
+    draw_qq(qq_data(samples, mu, sigma), ax)
+
+def draw_cdf(data, ax):
     """
     Empirical vs Theoretical CDF comparison - useful for channel characterization.
     """
     ax.clear()
     
     # Empirical CDF
-    sorted_samples = np.sort(samples)
-    y_empirical = np.arange(1, len(sorted_samples) + 1) / len(sorted_samples)
-    ax.plot(sorted_samples, y_empirical, 'b-', linewidth=2, 
+    ax.plot(data['cdf_x'], data['cdf_empirical'], 'b-', linewidth=2, drawstyle='steps-post',
            label='Empirical CDF', alpha=0.8)
     
     # Theoretical CDF
-    x_range = np.linspace(sorted_samples.min(), sorted_samples.max(), 200)
-    theoretical_cdf = stats.norm.cdf(x_range, mu, sigma)
-    ax.plot(x_range, theoretical_cdf, 'r--', linewidth=2, 
+    ax.plot(data['cdf_x'], data['cdf_theory'], 'r--', linewidth=2, 
            label='Theoretical CDF', alpha=0.9)
     
+    ax.set_xlim(data['cdf_x'][0], data['cdf_x'][-1])  # Changes only with the support
     ax.set_title("Cumulative Distribution\n(Empirical vs Theoretical CDF)", fontsize=12)
     ax.set_xlabel("Signal Amplitude")
     ax.set_ylabel("Cumulative Probability")
@@ -216,23 +376,54 @@ def plot_cdf(samples, ax, mu, sigma):
     ax.grid(True, alpha=0.3)
     
     # Add shaded area showing difference
-    if len(x_range) == len(theoretical_cdf):
-        empirical_interp = np.interp(x_range, sorted_samples, y_empirical)
-        ax.fill_between(x_range, empirical_interp, theoretical_cdf, 
-                       alpha=0.2, color='gray', label='Difference')
+    ax.fill_between(data['cdf_x'], data['cdf_empirical'], data['cdf_theory'], 
+                   alpha=0.2, color='gray', label='Difference')
+
+def plot_cdf(samples, ax, mu, sigma):
+    """
+    Empirical vs theoretical CDF of the samples.
+    """
+    draw_cdf(cdf_data(samples, mu, sigma), ax)
+
+def plot_convergence(columns, upto, ax):
+    """
+    Running mean ± std of the first upto frames of a stored run - drawn in
+    place of the time series when a replayed run has no raw samples.
+    """
+    ax.clear()
+    
+    n = columns['n'][:upto]
+    mean = columns['emp_mean'][:upto]
+    std = columns['emp_std'][:upto]
+    ax.plot(n, mean, 'b-', linewidth=2, label='Empirical Mean')
+    ax.fill_between(n, mean - std, mean + std, color='blue', alpha=0.15, label='± Empirical Std')
+    ax.axhline(y=mu, color='green', linestyle='--', linewidth=2, 
+              label=f'Theoretical Mean (μ={mu})')
+    ax.axhline(y=mu + sigma, color='orange', linestyle=':', alpha=0.7, 
+              label=f'μ ± σ bounds')
+    ax.axhline(y=mu - sigma, color='orange', linestyle=':', alpha=0.7)
+    
+    ax.set_title("Sample Statistics Convergence\n(Stored Run)", fontsize=12)
+    ax.set_xlabel("Number of Samples")
+    ax.set_ylabel("Signal Amplitude")
+    ax.legend(loc='upper right', fontsize=10)
+    ax.grid(True, alpha=0.3)
 
 # =============================================================================
 # STATISTICS CALCULATION
 # =============================================================================
 
-def calculate_statistics(samples, mu, sigma):
+def calculate_statistics(samples, mu, sigma, gof=False):
     """
     Calculate comprehensive statistics for wireless communication analysis.
+    Moments, SNR and PAPR come from the single-pass kernel in signal_metrics.py
+    (NaN instead of ±inf where a dB value is undefined). With gof=True the
+    statistics and p-values of the goodness-of-fit battery (goodness_of_fit.py)
+    are added as '<test>_stat' and '<test>_pvalue'.
     """
-    n = len(samples)
-    emp_mean = np.mean(samples)
-    emp_var = np.var(samples, ddof=1)
-    emp_std = np.sqrt(emp_var)
+    metrics = signal_metrics(samples)
+    emp_mean = metrics['emp_mean']
+    emp_var = metrics['emp_var']
     
     # Errors
     mean_error = abs(emp_mean - mu)
@@ -241,87 +432,182 @@ def calculate_statistics(samples, mu, sigma):
     # Statistical tests
     ks_stat, ks_pvalue = stats.kstest(samples, 'norm', args=(mu, sigma))
     
-    # Additional wireless-relevant statistics
-    snr_db = 20 * np.log10(abs(emp_mean) / emp_std) if emp_std > 0 else float('inf')
-    
-    # Peak-to-Average Power Ratio (PAPR) - relevant for OFDM systems
-    peak_power = np.max(samples**2)
-    avg_power = np.mean(samples**2)
-    papr_db = 10 * np.log10(peak_power / avg_power) if avg_power > 0 else float('inf')
-    
-    return {
-        'n': n,
+    results = {
+        'n': metrics['n'],
         'emp_mean': emp_mean,
         'emp_var': emp_var,
-        'emp_std': emp_std,
+        'emp_std': metrics['emp_std'],
         'mean_error': mean_error,
         'var_error': var_error,
         'ks_stat': ks_stat,
         'ks_pvalue': ks_pvalue,
-        'snr_db': snr_db,
-        'papr_db': papr_db
+        'snr_db': metrics['snr_db'],
+        'papr_db': metrics['papr_db']
     }
+    
+    # Goodness-of-fit battery (its KS test duplicates the one above)
+    if gof:
+        results.update({name: value for name, value in gof_statistics(samples, mu, sigma).items()
+                        if not name.startswith('ks_')})
+    return results
 
 # =============================================================================
-# ANIMATION SETUP
+# HEADLESS SESSION
 # =============================================================================
 
-# Create statistics display area
-stats_ax = fig.add_axes([0.08, 0.02, 0.4, 0.2])
-stats_ax.axis('off')
-
-# Create progress bar
-progress_ax = fig.add_axes([0.55, 0.15, 0.35, 0.03])
-progress_ax.set_xlim(0, 1)
-progress_ax.set_ylim(0, 1)
-progress_ax.axis('off')
-
-# Progress bar elements
-progress_bg = patches.Rectangle((0, 0.3), 1, 0.4, facecolor='lightgray', edgecolor='black')
-progress_bar = patches.Rectangle((0, 0.3), 0, 0.4, facecolor='green', alpha=0.7)
-progress_ax.add_patch(progress_bg)
-progress_ax.add_patch(progress_bar)
-
-# WCOM Lab info
-info_ax = fig.add_axes([0.55, 0.02, 0.4, 0.12])
-info_ax.axis('off')
-info_text = ("WCOM Lab Applications:\n"
-            "• Signal amplitude modeling\n"
-            "• Channel noise characterization\n"
-            "• OFDM system analysis\n"
-            "• Quality metrics (SNR, PAPR)")
-info_ax.text(0, 1, info_text, transform=info_ax.transAxes, fontsize=10,
-            verticalalignment='top', bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.3))
+def session_config():
+    """
+    The parameters that fully determine a session (used as the run-store key).
+    """
+    return {
+        'mu': mu,
+        'sigma': sigma,
+        'initial_sample_size': initial_sample_size,
+        'max_sample_size': max_sample_size,
+        'batch_size': batch_size,
+        'random_seed': random_seed,
+        'quantile_backend': quantile_backend,
+        'gof_tests': gof_tests,
+    }
 
-def update_frame(frame):
+def session_stream(config):
     """
-    Animation update function called for each frame.
+    The complete sample stream of a session, drawn in one go. Identical to
+    drawing the initial samples and then batch after batch from the same
+    seed (legacy NumPy seeding, as used by the animation).
     """
-    global samples
-    
-    current_size = len(samples)
-    
-    # Calculate new samples to add
-    if current_size + batch_size > max_sample_size:
-        new_count = max_sample_size - current_size
+    rng = np.random.RandomState(config['random_seed'])
+    size = max(config['max_sample_size'], config['initial_sample_size'])
+    return generate_samples(size, config['mu'], config['sigma'], rng)
+
+def _session_frames(config, frames, keep_frames=False, stream=None):
+    """
+    Statistics (and optionally drawing data) of the given frames of a session.
+    """
+    plan = build_frame_plan(config['initial_sample_size'], config['max_sample_size'],
+                            config['batch_size'])
+    if stream is None:
+        stream = session_stream(config)
+    results = []
+    for frame in frames:
+        frame_samples = stream[:plan['n'][frame]]
+        results.append((calculate_statistics(frame_samples, config['mu'], config['sigma'],
+                                             config.get('gof_tests', False)),
+                        compute_frame_data(frame_samples, config['mu'], config['sigma'])
+                        if keep_frames else None))
+    return results
+
+def _sketch_session_frames(config, plan, keep_frames=False):
+    """
+    Statistics (and optionally drawing data) of every frame, computed from a
+    KLL quantile sketch fed batch by batch: the samples are never kept, so
+    memory stays bounded however long the session is.
+    """
+    from quantile_sketch import KLLSketch, sketch_statistics, sketch_frame_data
+
+    rng = np.random.RandomState(config['random_seed'])
+    mu_s, sigma_s = config['mu'], config['sigma']
+    sketch = KLLSketch(seed=config['random_seed'])
+    sketch.update(generate_samples(config['initial_sample_size'], mu_s, sigma_s, rng))
+
+    results = []
+    for start, stop in zip(plan['batch_start'], plan['batch_stop']):
+        sketch.update(generate_samples(stop - start, mu_s, sigma_s, rng))
+        results.append((sketch_statistics(sketch, mu_s, sigma_s),
+                        sketch_frame_data(sketch, mu_s, sigma_s) if keep_frames else None))
+    return results
+
+def run_session(config, keep_samples=False, keep_frames=False, workers=1):
+    """
+    Runs a session without drawing: the same sample stream and frame plan as
+    the animation and the statistics of every frame.
+    Returns a dict with the list of statistics dicts ('stats'), the final
+    samples ('samples') and the stacked per-frame drawing data ('frames'),
+    the last two being None unless requested. With workers > 1 the frames are
+    computed in a process pool (each worker re-draws the seeded stream).
+    The 'kll' quantile backend computes the frames sequentially from a sketch
+    and never returns samples.
+    """
+    plan = build_frame_plan(config['initial_sample_size'], config['max_sample_size'],
+                            config['batch_size'])
+    if config.get('quantile_backend', 'exact') == 'kll':
+        stream = None
+        results = _sketch_session_frames(config, plan, keep_frames)
     else:
-        new_count = batch_size
-    
-    if new_count <= 0:
-        return []
-    
-    # Generate new samples
-    new_samples = np.random.normal(loc=mu, scale=sigma, size=new_count)
-    samples = np.append(samples, new_samples)
-    
+        stream = session_stream(config)
+    frame_indices = range(plan['num_frames'])
+
+    if stream is None:
+        pass
+    elif workers > 1 and plan['num_frames'] > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        # Round-robin split balances the growing cost of later frames
+        chunks = [list(frame_indices[w::workers]) for w in range(workers)]
+        results = [None] * plan['num_frames']
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = [pool.submit(_session_frames, config, chunk, keep_frames) for chunk in chunks]
+            for chunk, future in zip(chunks, futures):
+                for frame, result in zip(chunk, future.result()):
+                    results[frame] = result
+    else:
+        results = _session_frames(config, frame_indices, keep_frames, stream)
+
+    frames = None
+    if keep_frames and results:
+        frame_data = [data for _, data in results]
+        frames = {name: np.array([d[name] for d in frame_data]) for name in frame_data[0]}
+
+    return {
+        'stats': [frame_stats for frame_stats, _ in results],
+        'samples': stream if keep_samples and stream is not None else None,
+        'frames': frames,
+    }
+
+# =============================================================================
+# ANIMATION UPDATE
+# =============================================================================
+
+# Session state set up by the script: the frame plan, the pre-drawn sample
+# stream and the stored run (when store_results or replay is on)
+frame_plan = None
+sample_stream = None
+recorded_run = None
+snapshot_records = None     # Frame snapshot array filled while exporting
+frame_times = []            # perf_counter() of every frame drawn while playing
+playing = False             # True while the animation is shown (frames are timed)
+DURATION_SAMPLE_FRACTION = 0.25  # Share of frames timed before the duration is printed
+
+def render_frame(frame, data, stats, samples=None):
+    """
+    Draws one frame from its precomputed data and statistics. Shared by the
+    live animation and replay mode, so both produce identical figures.
+    """
+    # Time the shown frames: once a share of them has been shown, the duration
+    # is estimated from the time so far (the first frame includes the warm-up
+    # draw, so the remaining ones are timed from the second)
+    if playing:
+        frame_times.append(time.perf_counter())
+        if len(frame_times) == max(3, int(DURATION_SAMPLE_FRACTION * num_frames)):
+            frame_time = (frame_times[-1] - frame_times[1]) / (len(frame_times) - 2)
+            duration = (frame_times[-1] - frame_times[0]
+                        + (num_frames - len(frame_times) + 1) * frame_time)
+            print(f"Animation duration: ~{duration:.1f} seconds "
+                  f"({frame_time * 1000:.0f} ms per frame, measured)")
+
     # Update all plots
-    plot_histogram(samples, ax_hist, mu, sigma)
-    plot_time_series(samples, ax_time)
-    plot_qq(samples, ax_qq, mu, sigma)
-    plot_cdf(samples, ax_cdf, mu, sigma)
+    draw_histogram(data, ax_hist)
+    if samples is not None:
+        plot_time_series(samples, ax_time)
+    else:
+        plot_convergence(recorded_run['columns'], frame + 1, ax_time)
+    draw_qq(data, ax_qq)
+    draw_cdf(data, ax_cdf)
     
-    # Calculate and display statistics
-    stats = calculate_statistics(samples, mu, sigma)
+    # Goodness-of-fit battery p-values, when gof_tests is on
+    gof_text = ""
+    if 'ad_pvalue' in stats:
+        gof_text = (f"AD/CvM/SW p-value:  {stats['ad_pvalue']:.3f} / {stats['cvm_pvalue']:.3f} / "
+                    f"{stats['sw_pvalue']:.3f}\n")
     
     stats_text = (
         f"SAMPLE STATISTICS (n = {stats['n']})\n"
@@ -335,6 +621,7 @@ def update_frame(frame):
         f"{'='*40}\n"
         f"KS Statistic:       {stats['ks_stat']:8.4f}\n"
         f"KS p-value:         {stats['ks_pvalue']:8.4f}\n"
+        f"{gof_text}"
         f"\nWCOM METRICS\n"
         f"{'='*40}\n"
         f"SNR (dB):           {stats['snr_db']:8.2f}\n"
@@ -348,75 +635,220 @@ def update_frame(frame):
                  bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
     
     # Update progress bar
-    progress = len(samples) / max_sample_size
+    progress = stats['n'] / max_sample_size
     progress_bar.set_width(progress)
     
-    # Add annotations at key frames
-    if frame == 0:
-        ax_hist.annotate("Starting: Small sample, high variability", 
-                        xy=(0.02, 0.98), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7),
-                        fontsize=9)
-    elif len(samples) >= max_sample_size * 0.25 and len(samples) < max_sample_size * 0.25 + batch_size:
-        ax_hist.annotate("25% complete: Shape emerging", 
-                        xy=(0.02, 0.90), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='orange', alpha=0.7),
-                        fontsize=9)
-    elif len(samples) >= max_sample_size * 0.75 and len(samples) < max_sample_size * 0.75 + batch_size:
-        ax_hist.annotate("75% complete: Converging to theory", 
-                        xy=(0.02, 0.82), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7),
-                        fontsize=9)
-    elif len(samples) == max_sample_size:
-        ax_hist.annotate("Complete: Law of Large Numbers demonstrated!", 
-                        xy=(0.02, 0.74), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.7),
+    # Add the milestone annotations scheduled for this frame
+    for text, y, color in frame_plan['milestones'].get(frame, []):
+        ax_hist.annotate(text, 
+                        xy=(0.02, y), xycoords='axes fraction',
+                        bbox=dict(boxstyle='round', facecolor=color, alpha=0.7),
                         fontsize=9)
     
+    # Record the frame for the binary snapshot export
+    if snapshot_records is not None:
+        frame_snapshot.fill_snapshot(snapshot_records[frame], frame, data, stats)
+    
     return []
 
-# =============================================================================
-# ANIMATION EXECUTION
-# =============================================================================
+def update_frame(frame):
+    """
+    Animation update function called for each frame.
+    """
+    global samples
+    
+    # Samples shown in this frame: a prefix of the pre-drawn sample stream
+    samples = sample_stream[:frame_plan['n'][frame]]
+    
+    # Calculate statistics (looked up by sample count in a stored run)
+    if recorded_run is not None and len(samples) in recorded_run['stats_by_n']:
+        stats = recorded_run['stats_by_n'][len(samples)]
+    else:
+        stats = calculate_statistics(samples, mu, sigma, gof_tests)
+    
+    return render_frame(frame, compute_frame_data(samples, mu, sigma), stats, samples)
 
-# Calculate number of frames
-num_frames = (max_sample_size - initial_sample_size) // batch_size + 1
-if (max_sample_size - initial_sample_size) % batch_size != 0:
-    num_frames += 1
-
-print(f"Animation frames: {num_frames}")
-print(f"Animation duration: ~{num_frames * animation_interval / 1000:.1f} seconds")
-
-# Create animation
-anim = FuncAnimation(fig, update_frame, frames=num_frames, 
-                    interval=animation_interval, blit=False, repeat=False)
-
-# Display initial plots
-plot_histogram(samples, ax_hist, mu, sigma)
-plot_time_series(samples, ax_time)
-plot_qq(samples, ax_qq, mu, sigma)
-plot_cdf(samples, ax_cdf, mu, sigma)
-
-# Initial statistics
-initial_stats = calculate_statistics(samples, mu, sigma)
-print(f"Animation ready. Initial KS statistic: {initial_stats['ks_stat']:.4f}")
-
-# Save animation if requested
-if save_animation:
-    print("Saving animation...")
-    try:
-        anim.save('wcom_gaussian_animation.gif', writer='pillow', fps=3)
-        print("Animation saved as 'wcom_gaussian_animation.gif'")
-    except:
-        print("Could not save animation. Install pillow or ffmpeg for saving.")
-
-# Show the animation
-plt.tight_layout()
-plt.show()
-
-print("\nAnimation complete!")
-print("Key learning points demonstrated:")
-print("1. Law of Large Numbers - sample statistics converge to population parameters")
-print("2. Central Limit Theorem - sample distribution approaches normal")
-print("3. Statistical validation through KS test and Q-Q plot")
-print("4. Wireless communication relevance - signal modeling and characterization")
\ No newline at end of file
+def replay_frame(frame):
+    """
+    Replay-mode update function: draws frame `frame` of the stored run without
+    sampling or recomputing anything. Frames can be drawn in any order.
+    """
+    frame_data = {name: column[frame] for name, column in recorded_run['frames'].items()}
+    stats = recorded_run['stats'][frame]
+    samples_so_far = None
+    if recorded_run['samples'] is not None:
+        samples_so_far = recorded_run['samples'][:stats['n']]
+    return render_frame(frame, frame_data, stats, samples_so_far)
+
+# The figure and animation are only built when run as a script, so the helpers
+# above can be imported by the other WCOM Lab tools without opening a window.
+if __name__ == "__main__":
+    # =============================================================================
+    # INITIALIZATION
+    # =============================================================================
+
+    print("=" * 60)
+    print("WCOM Lab - Gaussian Distribution Animation")
+    print("=" * 60)
+    print(f"Parameters: μ={mu}, σ={sigma}")
+    print(f"Sample progression: {initial_sample_size} → {max_sample_size} (batch: {batch_size})")
+    print("=" * 60)
+
+    # Build the frame plan. The exact backend draws the whole sample stream up
+    # front; the sketch backend only draws the initial samples (identical to the
+    # start of the stream) and streams the batches into the sketch in run_session
+    frame_plan = build_frame_plan(initial_sample_size, max_sample_size, batch_size)
+    if quantile_backend == 'exact':
+        sample_stream = session_stream(session_config())
+        samples = sample_stream[:initial_sample_size]
+    else:
+        samples = generate_samples(initial_sample_size, mu, sigma,
+                                   np.random.RandomState(random_seed))
+
+    print(f"Initial samples generated: {len(samples)}")
+    print(f"Initial sample statistics:")
+    print(f"  Mean: {np.mean(samples):.4f} (theoretical: {mu})")
+    print(f"  Std:  {np.std(samples, ddof=1):.4f} (theoretical: {sigma})")
+
+    # =============================================================================
+    # FIGURE AND SUBPLOT SETUP
+    # =============================================================================
+
+    # Create figure with enhanced styling for WCOM lab
+    plt.style.use('default')
+    fig = plt.figure(figsize=(15, 10))
+    fig.suptitle('WCOM Lab: Gaussian Distribution Learning Animation\n' + 
+                 f'μ={mu}, σ={sigma} | Wireless Communication Applications', 
+                 fontsize=16, fontweight='bold', y=0.95)
+
+    # Create 2x2 grid of subplots with custom spacing
+    gs = fig.add_gridspec(2, 2, hspace=0.3, wspace=0.3, 
+                          left=0.08, right=0.95, top=0.85, bottom=0.25)
+
+    ax_hist = fig.add_subplot(gs[0, 0])
+    ax_time = fig.add_subplot(gs[0, 1])
+    ax_qq = fig.add_subplot(gs[1, 0])
+    ax_cdf = fig.add_subplot(gs[1, 1])
+
+    axes = [ax_hist, ax_time, ax_qq, ax_cdf]
+
+    # Set initial titles with WCOM context
+    ax_hist.set_title("Signal Amplitude Distribution\n(Histogram vs Theoretical PDF)", fontsize=12)
+    ax_time.set_title("Signal Samples Over Time\n(Time Series)", fontsize=12)
+    ax_qq.set_title("Normality Check\n(Q-Q Plot)", fontsize=12)
+    ax_cdf.set_title("Cumulative Distribution\n(Empirical vs Theoretical CDF)", fontsize=12)
+
+    # =============================================================================
+    # ANIMATION SETUP
+    # =============================================================================
+
+    # Create statistics display area
+    stats_ax = fig.add_axes([0.08, 0.02, 0.4, 0.2])
+    stats_ax.axis('off')
+
+    # Create progress bar
+    progress_ax = fig.add_axes([0.55, 0.15, 0.35, 0.03])
+    progress_ax.set_xlim(0, 1)
+    progress_ax.set_ylim(0, 1)
+    progress_ax.axis('off')
+
+    # Progress bar elements
+    progress_bg = patches.Rectangle((0, 0.3), 1, 0.4, facecolor='lightgray', edgecolor='black')
+    progress_bar = patches.Rectangle((0, 0.3), 0, 0.4, facecolor='green', alpha=0.7)
+    progress_ax.add_patch(progress_bg)
+    progress_ax.add_patch(progress_bar)
+
+    # WCOM Lab info
+    info_ax = fig.add_axes([0.55, 0.02, 0.4, 0.12])
+    info_ax.axis('off')
+    info_text = ("WCOM Lab Applications:\n"
+                "• Signal amplitude modeling\n"
+                "• Channel noise characterization\n"
+                "• OFDM system analysis\n"
+                "• Quality metrics (SNR, PAPR)")
+    info_ax.text(0, 1, info_text, transform=info_ax.transAxes, fontsize=10,
+                verticalalignment='top', bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.3))
+
+    # =============================================================================
+    # ANIMATION EXECUTION
+    # =============================================================================
+
+    num_frames = frame_plan['num_frames']
+    print(f"Animation frames: {num_frames}")
+
+    # The quantile sketch backend precomputes the session and replays it
+    replay = replay or quantile_backend != 'exact'
+
+    # Load the stored statistics of an identical run, or compute and store them
+    if store_results or replay:
+        import run_store
+        recorded_run = run_store.cached_session(session_config(), keep_samples=store_samples,
+                                                keep_frames=replay)
+        if recorded_run['samples'] is not None:
+            sample_stream = recorded_run['samples']
+        print(f"Run {recorded_run['key']}: {'loaded from' if recorded_run['cached'] else 'stored in'} "
+              f"{run_store.RESULTS_DIR}")
+
+    # Create animation (replay mode only draws the recorded frames). The initial
+    # plots are drawn below, so the init step draws nothing and every call of
+    # the update function is a shown frame.
+    if replay:
+        print(f"Replay mode: {len(recorded_run['stats'])} recorded frames")
+        anim = FuncAnimation(fig, replay_frame, frames=num_frames, init_func=lambda: [],
+                            interval=animation_interval, blit=False, repeat=False)
+    else:
+        anim = FuncAnimation(fig, update_frame, frames=num_frames, init_func=lambda: [],
+                            interval=animation_interval, blit=False, repeat=False)
+
+    # Frames are shown every animation_interval or, when drawing takes longer,
+    # as soon as they are drawn: the duration is printed once a share
+    # (DURATION_SAMPLE_FRACTION) of the frames has been timed, and the playback
+    # time at the end
+    print(f"Nominal duration: ~{num_frames * animation_interval / 1000:.1f} seconds "
+          f"({animation_interval} ms per frame)")
+
+    # Display initial plots
+    plot_histogram(samples, ax_hist, mu, sigma)
+    plot_time_series(samples, ax_time)
+    plot_qq(samples, ax_qq, mu, sigma)
+    plot_cdf(samples, ax_cdf, mu, sigma)
+
+    # Initial statistics
+    initial_stats = calculate_statistics(samples, mu, sigma, gof_tests)
+    print(f"Animation ready. Initial KS statistic: {initial_stats['ks_stat']:.4f}")
+
+    # Save animation if requested
+    if save_animation:
+        if export_snapshots:
+            import frame_snapshot
+            snapshot_records = np.zeros(num_frames, dtype=frame_snapshot.SNAPSHOT_DTYPE)
+        print("Saving animation...")
+        try:
+            anim.save('wcom_gaussian_animation.gif', writer='pillow', fps=3)
+            print("Animation saved as 'wcom_gaussian_animation.gif'")
+        except:
+            print("Could not save animation. Install pillow or ffmpeg for saving.")
+        if export_snapshots:
+            snapshot_records.tofile('wcom_gaussian_frames.wcsn')
+            print(f"Frame snapshots saved as 'wcom_gaussian_frames.wcsn' "
+                  f"({frame_snapshot.SNAPSHOT_DTYPE.itemsize} bytes per frame)")
+            snapshot_records = None
+
+    # Show the animation
+    plt.tight_layout()
+    playing = True
+    plt.show()
+    playing = False
+
+    # Playback time measured from the frames as they were drawn
+    if len(frame_times) > 1:
+        frame_time = (frame_times[-1] - frame_times[0]) / (len(frame_times) - 1)
+        print(f"Playback: {len(frame_times)} frames in ~{len(frame_times) * frame_time:.1f} seconds "
+              f"({frame_time * 1000:.0f} ms per frame)")
+
+    print("\nAnimation complete!")
+    print("Key learning points demonstrated:")
+    print("1. Law of Large Numbers - sample statistics converge to population parameters")
+    print("2. Central Limit Theorem - sample distribution approaches normal")
+    print("3. Statistical validation through KS test and Q-Q plot")
+    print("4. Wireless communication relevance - signal modeling and characterization")
\ No newline at end of file
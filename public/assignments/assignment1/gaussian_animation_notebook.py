@@ -41,9 +41,27 @@ import scipy.stats as stats
 import matplotlib.pyplot as plt
 from matplotlib.animation import FuncAnimation
 import matplotlib.patches as patches
+from functools import lru_cache
 import warnings
 warnings.filterwarnings('ignore')
 
+# Frame plan and per-frame drawing data shared with gaussian_animation.py
+from gaussian_animation import (build_frame_plan, compute_frame_data, curve_support,
+                                histogram_bin_count, theory_curves)
+from signal_metrics import signal_metrics
+
+# Widget mode: in-place updates with a frame slider (pip install ipywidgets ipympl)
+try:
+    import ipywidgets as widgets
+    from IPython.display import display
+except ImportError:  # Without ipywidgets the notebook falls back to FuncAnimation
+    widgets = None
+try:
+    import ipympl
+    get_ipython().run_line_magic('matplotlib', 'widget')
+except (ImportError, NameError):  # Without ipympl each frame is shown as a static image
+    ipympl = None
+
 # Configure matplotlib for Jupyter
 plt.rcParams['figure.facecolor'] = 'white'
 plt.rcParams['axes.facecolor'] = 'white'
@@ -51,6 +69,8 @@ plt.rcParams['axes.facecolor'] = 'white'
 print("✅ Libraries imported successfully!")
 print(f"NumPy version: {np.__version__}")
 print(f"Matplotlib version: {plt.matplotlib.__version__}")
+print(f"Widget mode: {'available' if widgets is not None else 'unavailable (install ipywidgets)'}"
+      f"{' with ipympl canvas' if ipympl is not None else ''}")
 
 # %% [markdown]
 """
@@ -77,13 +97,30 @@ random_seed = 42            # Random seed for reproducibility
 # Animation settings
 animation_interval = 400    # Milliseconds between frames
 save_animation = False      # Set to True to save animation
+notebook_mode = 'widget'    # 'widget': in-place updates + frame slider, 'animation': FuncAnimation
+time_series_points = 5000   # Older samples drawn in the widget time series (decimated beyond)
+
+# Milestone annotations: (fraction of max_sample_size reached, text, y position, color).
+# The starting annotation (fraction None) is shown on the first frame.
+NOTEBOOK_MILESTONES = [
+    (None, "🚀 Starting: Small sample, high variability", 0.98, 'yellow'),
+    (0.25, "📈 25% complete: Shape emerging", 0.90, 'orange'),
+    (0.50, "📊 50% complete: Distribution stabilizing", 0.82, 'lightblue'),
+    (0.75, "🎯 75% complete: Converging to theory", 0.74, 'lightgreen'),
+    (1.00, "🏆 Complete: Law of Large Numbers demonstrated!", 0.66, 'gold'),
+]
+
+# Frame schedule of the whole session, built once: both the animation and the
+# widget view take their milestones from it
+frame_plan = build_frame_plan(initial_sample_size, max_sample_size, batch_size,
+                              NOTEBOOK_MILESTONES)
 
 print("📊 Configuration Summary:")
 print(f"   Distribution: N(μ={mu}, σ²={sigma**2})")
 print(f"   Sample progression: {initial_sample_size} → {max_sample_size}")
 print(f"   Batch size: {batch_size} samples per frame")
 print(f"   Animation speed: {animation_interval}ms per frame")
-print(f"   Expected frames: {(max_sample_size - initial_sample_size) // batch_size + 1}")
+print(f"   Expected frames: {frame_plan['num_frames']}")
 
 # %% [markdown]
 """
@@ -91,11 +128,11 @@ print(f"   Expected frames: {(max_sample_size - initial_sample_size) // batch_si
 """
 
 # %%
-# Initialize random number generator
+# Draw the whole sample stream up front: frame i shows its first frame_plan['n'][i] samples
 np.random.seed(random_seed)
-
-# Generate initial samples
-samples = np.random.normal(loc=mu, scale=sigma, size=initial_sample_size)
+sample_stream = np.random.normal(loc=mu, scale=sigma,
+                                 size=max(max_sample_size, initial_sample_size))
+samples = sample_stream[:initial_sample_size]
 
 print(f"🎯 Initial samples generated: {len(samples)}")
 print(f"📈 Initial statistics:")
@@ -123,14 +160,14 @@ def plot_histogram(samples, ax, mu, sigma):
     ax.clear()
     
     # Plot histogram
-    n, bins, patches = ax.hist(samples, bins=min(50, max(10, len(samples)//20)), 
+    n, bins, patches = ax.hist(samples, bins=histogram_bin_count(len(samples)), 
                               density=True, alpha=0.7, color='skyblue', 
                               edgecolor='navy', linewidth=0.5,
                               label='Empirical Histogram')
     
-    # Theoretical PDF
-    x_range = np.linspace(samples.min() - 0.5*sigma, samples.max() + 0.5*sigma, 200)
-    theoretical_pdf = stats.norm.pdf(x_range, mu, sigma)
+    # Theoretical PDF (cached, on a fixed support around mu)
+    x_range, theoretical_pdf, _ = theory_curves(
+        mu, sigma, curve_support(samples.min(), samples.max(), mu, sigma))
     ax.plot(x_range, theoretical_pdf, 'r-', linewidth=3, 
             label='Theoretical PDF', alpha=0.9)
     
@@ -143,6 +180,7 @@ def plot_histogram(samples, ax, mu, sigma):
         except:
             pass
     
+    ax.set_xlim(x_range[0], x_range[-1])
     ax.set_title("Signal Amplitude Distribution\n(Histogram vs Theoretical PDF)", fontsize=11)
     ax.set_xlabel("Signal Amplitude")
     ax.set_ylabel("Probability Density")
@@ -228,11 +266,12 @@ def plot_cdf(samples, ax, mu, sigma):
     ax.plot(sorted_samples, y_empirical, 'b-', linewidth=2, 
            label='Empirical CDF', alpha=0.8)
     
-    # Theoretical CDF
-    x_range = np.linspace(sorted_samples.min(), sorted_samples.max(), 200)
-    theoretical_cdf = stats.norm.cdf(x_range, mu, sigma)
+    # Theoretical CDF (cached, on a fixed support around mu)
+    x_range, _, theoretical_cdf = theory_curves(
+        mu, sigma, curve_support(sorted_samples[0], sorted_samples[-1], mu, sigma))
     ax.plot(x_range, theoretical_cdf, 'r--', linewidth=2, 
            label='Theoretical CDF', alpha=0.9)
+    ax.set_xlim(x_range[0], x_range[-1])
     
     ax.set_title("Cumulative Distribution\n(Empirical vs Theoretical CDF)", fontsize=11)
     ax.set_xlabel("Signal Amplitude")
@@ -253,49 +292,32 @@ Function to calculate comprehensive statistics relevant to wireless communicatio
 def calculate_statistics(samples, mu, sigma):
     """
     Calculate comprehensive statistics for wireless communication analysis.
+    Moments, SNR, PAPR and the 95% confidence interval come from the
+    single-pass kernel in signal_metrics.py (NaN where a dB value is undefined).
     """
-    n = len(samples)
-    emp_mean = np.mean(samples)
-    emp_var = np.var(samples, ddof=1)
-    emp_std = np.sqrt(emp_var)
+    metrics = signal_metrics(samples, confidence=0.95)
     
     # Errors
-    mean_error = abs(emp_mean - mu)
-    var_error = abs(emp_var - sigma**2)
+    mean_error = abs(metrics['emp_mean'] - mu)
+    var_error = abs(metrics['emp_var'] - sigma**2)
     
     # Statistical tests
     ks_stat, ks_pvalue = stats.kstest(samples, 'norm', args=(mu, sigma))
     
-    # Additional wireless-relevant statistics
-    snr_db = 20 * np.log10(abs(emp_mean) / emp_std) if emp_std > 0 else float('inf')
-    
-    # Peak-to-Average Power Ratio (PAPR) - relevant for OFDM systems
-    peak_power = np.max(samples**2)
-    avg_power = np.mean(samples**2)
-    papr_db = 10 * np.log10(peak_power / avg_power) if avg_power > 0 else float('inf')
-    
-    # Confidence intervals
-    confidence_level = 0.95
-    alpha = 1 - confidence_level
-    t_critical = stats.t.ppf(1 - alpha/2, n-1)
-    margin_error = t_critical * emp_std / np.sqrt(n)
-    ci_lower = emp_mean - margin_error
-    ci_upper = emp_mean + margin_error
-    
     return {
-        'n': n,
-        'emp_mean': emp_mean,
-        'emp_var': emp_var,
-        'emp_std': emp_std,
+        'n': metrics['n'],
+        'emp_mean': metrics['emp_mean'],
+        'emp_var': metrics['emp_var'],
+        'emp_std': metrics['emp_std'],
         'mean_error': mean_error,
         'var_error': var_error,
         'ks_stat': ks_stat,
         'ks_pvalue': ks_pvalue,
-        'snr_db': snr_db,
-        'papr_db': papr_db,
-        'ci_lower': ci_lower,
-        'ci_upper': ci_upper,
-        'margin_error': margin_error
+        'snr_db': metrics['snr_db'],
+        'papr_db': metrics['papr_db'],
+        'ci_lower': metrics['ci_lower'],
+        'ci_upper': metrics['ci_upper'],
+        'margin_error': metrics['margin_error']
     }
 
 # Test the function with initial samples
@@ -366,39 +388,13 @@ info_ax.text(0, 1, info_text, transform=info_ax.transAxes, fontsize=10,
 print("🎬 Animation setup complete!")
 
 # %%
-def update_frame(frame):
+def format_stats_text(stats):
     """
-    Animation update function called for each frame.
+    Statistics panel text of one frame.
     """
-    global samples
-    
-    current_size = len(samples)
-    
-    # Calculate new samples to add
-    if current_size + batch_size > max_sample_size:
-        new_count = max_sample_size - current_size
-    else:
-        new_count = batch_size
-    
-    if new_count <= 0:
-        return []
-    
-    # Generate new samples
-    new_samples = np.random.normal(loc=mu, scale=sigma, size=new_count)
-    samples = np.append(samples, new_samples)
-    
-    # Update all plots
-    plot_histogram(samples, ax_hist, mu, sigma)
-    plot_time_series(samples, ax_time)
-    plot_qq(samples, ax_qq, mu, sigma)
-    plot_cdf(samples, ax_cdf, mu, sigma)
-    
-    # Calculate and display statistics
-    stats = calculate_statistics(samples, mu, sigma)
-    
     # Determine convergence status
     convergence_status = "🔴 Poor" if stats['ks_stat'] > 0.1 else "🟡 Fair" if stats['ks_stat'] > 0.05 else "🟢 Good"
-    
+
     stats_text = (
         f"📊 SAMPLE STATISTICS (n = {stats['n']:,})\n"
         f"{'='*50}\n"
@@ -418,6 +414,27 @@ def update_frame(frame):
         f"📶 SNR (dB):           {stats['snr_db']:8.2f}\n"
         f"⚡ PAPR (dB):          {stats['papr_db']:8.2f}"
     )
+    return stats_text
+
+def update_frame(frame):
+    """
+    Animation update function called for each frame.
+    """
+    global samples
+    
+    # Samples shown in this frame: a prefix of the pre-drawn sample stream
+    samples = sample_stream[:frame_plan['n'][frame]]
+    
+    # Update all plots
+    plot_histogram(samples, ax_hist, mu, sigma)
+    plot_time_series(samples, ax_time)
+    plot_qq(samples, ax_qq, mu, sigma)
+    plot_cdf(samples, ax_cdf, mu, sigma)
+    
+    # Calculate and display statistics
+    stats = calculate_statistics(samples, mu, sigma)
+    
+    stats_text = format_stats_text(stats)
     
     stats_ax.clear()
     stats_ax.axis('off')
@@ -430,39 +447,17 @@ def update_frame(frame):
     progress_bar.set_width(progress)
     progress_text.set_text(f'{progress*100:.1f}%')
     
-    # Add annotations at key frames
-    if frame == 0:
-        ax_hist.annotate("🚀 Starting: Small sample, high variability", 
-                        xy=(0.02, 0.98), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7),
-                        fontsize=9)
-    elif len(samples) >= max_sample_size * 0.25 and len(samples) < max_sample_size * 0.25 + batch_size:
-        ax_hist.annotate("📈 25% complete: Shape emerging", 
-                        xy=(0.02, 0.90), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='orange', alpha=0.7),
-                        fontsize=9)
-    elif len(samples) >= max_sample_size * 0.50 and len(samples) < max_sample_size * 0.50 + batch_size:
-        ax_hist.annotate("📊 50% complete: Distribution stabilizing", 
-                        xy=(0.02, 0.82), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='lightblue', alpha=0.7),
+    # Add the milestone annotations scheduled for this frame
+    for text, y, color in frame_plan['milestones'].get(frame, []):
+        ax_hist.annotate(text, 
+                        xy=(0.02, y), xycoords='axes fraction',
+                        bbox=dict(boxstyle='round', facecolor=color, alpha=0.7),
                         fontsize=9)
-    elif len(samples) >= max_sample_size * 0.75 and len(samples) < max_sample_size * 0.75 + batch_size:
-        ax_hist.annotate("🎯 75% complete: Converging to theory", 
-                        xy=(0.02, 0.74), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='lightgreen', alpha=0.7),
-                        fontsize=9)
-    elif len(samples) == max_sample_size:
-        ax_hist.annotate("🏆 Complete: Law of Large Numbers demonstrated!", 
-                        xy=(0.02, 0.66), xycoords='axes fraction',
-                        bbox=dict(boxstyle='round', facecolor='gold', alpha=0.8),
-                        fontsize=9, fontweight='bold')
     
     return []
 
-# Calculate number of frames
-num_frames = (max_sample_size - initial_sample_size) // batch_size + 1
-if (max_sample_size - initial_sample_size) % batch_size != 0:
-    num_frames += 1
+# Number of frames from the frame plan
+num_frames = frame_plan['num_frames']
 
 print(f"🎬 Animation parameters:")
 print(f"   Total frames: {num_frames}")
@@ -470,11 +465,166 @@ print(f"   Duration: ~{num_frames * animation_interval / 1000:.1f} seconds")
 print(f"   Frame interval: {animation_interval}ms")
 
 # Reset samples to initial state
-np.random.seed(random_seed)
-samples = np.random.normal(loc=mu, scale=sigma, size=initial_sample_size)
+samples = sample_stream[:initial_sample_size]
 
 print("\n🎯 Ready to start animation!")
 
+# %% [markdown]
+"""
+## 🎛️ Widget Mode (fast notebook rendering)
+
+FuncAnimation in a notebook re-renders every frame into a JS/HTML animation.
+Widget mode instead creates the plot elements once and only swaps their data
+when the frame changes, driven by a slider (with a play button) over the
+precomputed frame plan. Frames are computed on demand and cached, so large
+runs stay interactive and the notebook output stays a single figure.
+"""
+
+# %%
+@lru_cache(maxsize=256)
+def frame_view(frame):
+    """
+    Drawing data and statistics of one frame (computed once, then cached).
+    """
+    frame_samples = sample_stream[:frame_plan['n'][frame]]
+    return compute_frame_data(frame_samples, mu, sigma), calculate_statistics(frame_samples, mu, sigma)
+
+artists = {}
+
+def setup_artists():
+    """
+    Creates every plot element once, with empty data.
+    """
+    for ax in (ax_hist, ax_time, ax_qq, ax_cdf):
+        ax.clear()
+        ax.grid(True, alpha=0.3)
+
+    artists['hist'] = ax_hist.stairs([0.0], [0.0, 1.0], fill=True, facecolor='skyblue',
+                                     edgecolor='navy', linewidth=0.5, alpha=0.7,
+                                     label='Empirical Histogram')
+    artists['pdf'], = ax_hist.plot([], [], 'r-', linewidth=3, label='Theoretical PDF', alpha=0.9)
+    artists['kde'], = ax_hist.plot([], [], 'g--', linewidth=2, label='Smoothed Empirical', alpha=0.8)
+    artists['milestone'] = ax_hist.annotate('', xy=(0.02, 0.98), xycoords='axes fraction',
+                                            bbox=dict(boxstyle='round', facecolor='yellow', alpha=0.7),
+                                            fontsize=9, verticalalignment='top')
+    ax_hist.set_title("Signal Amplitude Distribution\n(Histogram vs Theoretical PDF)", fontsize=11)
+    ax_hist.set_xlabel("Signal Amplitude")
+    ax_hist.set_ylabel("Probability Density")
+    ax_hist.legend(loc='upper right', fontsize=9)
+
+    artists['previous'], = ax_time.plot([], [], 'b.', alpha=0.6, markersize=3, label='Previous samples')
+    artists['recent'], = ax_time.plot([], [], 'r.', alpha=0.8, markersize=4, label='Recent samples')
+    ax_time.axhline(y=mu, color='green', linestyle='--', linewidth=2, label=f'Theoretical Mean (μ={mu})')
+    ax_time.axhline(y=mu + sigma, color='orange', linestyle=':', alpha=0.7, label=f'μ ± σ bounds')
+    ax_time.axhline(y=mu - sigma, color='orange', linestyle=':', alpha=0.7)
+    ax_time.set_title("Signal Samples Over Time\n(Time Series)", fontsize=11)
+    ax_time.set_xlabel("Sample Index (Time)")
+    ax_time.set_ylabel("Signal Amplitude")
+    ax_time.legend(loc='upper right', fontsize=9)
+
+    artists['qq'], = ax_qq.plot([], [], 'o', markerfacecolor='blue', markeredgecolor='darkblue',
+                                markersize=4, alpha=0.7)
+    artists['qq_fit'], = ax_qq.plot([], [], 'r-', linewidth=2)
+    artists['r_squared'] = ax_qq.text(0.05, 0.95, '', transform=ax_qq.transAxes, fontsize=9,
+                                      bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+    ax_qq.set_title("Normality Check\n(Q-Q Plot)", fontsize=11)
+    ax_qq.set_xlabel("Theoretical Quantiles")
+    ax_qq.set_ylabel("Sample Quantiles")
+
+    artists['cdf'], = ax_cdf.plot([], [], 'b-', linewidth=2, label='Empirical CDF', alpha=0.8)
+    artists['cdf_theory'], = ax_cdf.plot([], [], 'r--', linewidth=2, label='Theoretical CDF', alpha=0.9)
+    ax_cdf.set_title("Cumulative Distribution\n(Empirical vs Theoretical CDF)", fontsize=11)
+    ax_cdf.set_xlabel("Signal Amplitude")
+    ax_cdf.set_ylabel("Cumulative Probability")
+    ax_cdf.legend(loc='lower right', fontsize=9)
+
+    stats_ax.clear()
+    stats_ax.axis('off')
+    artists['stats'] = stats_ax.text(0, 1, '', transform=stats_ax.transAxes, fontsize=9,
+                                     verticalalignment='top', fontfamily='monospace',
+                                     bbox=dict(boxstyle='round', facecolor='lightyellow', alpha=0.8))
+
+def show_frame(frame):
+    """
+    Updates the existing plot elements to frame `frame` of the plan.
+    """
+    global samples
+    samples = sample_stream[:frame_plan['n'][frame]]
+    data, stats = frame_view(frame)
+
+    bins = data['hist_bins']
+    artists['hist'].set_data(data['hist_density'][:bins], data['hist_edges'][:bins + 1])
+    artists['pdf'].set_data(data['pdf_x'], data['theory_pdf'])
+    artists['kde'].set_data(data['pdf_x'], data['kde_pdf'])
+
+    # Latest milestone reached so far
+    reached = [m for f, ms in frame_plan['milestones'].items() if f <= frame for m in ms]
+    artists['milestone'].set_visible(bool(reached))
+    if reached:
+        text, _, color = reached[-1]
+        artists['milestone'].set_text(text)
+        artists['milestone'].get_bbox_patch().set_facecolor(color)
+
+    # Time series: older samples decimated to time_series_points markers
+    recent_start = max(0, len(samples) - batch_size)
+    step = max(1, recent_start // time_series_points)
+    artists['previous'].set_data(np.arange(0, recent_start, step), samples[:recent_start:step])
+    artists['recent'].set_data(np.arange(recent_start, len(samples)), samples[recent_start:])
+
+    points = data['qq_points']
+    qq_x = data['qq_theoretical'][:points]
+    artists['qq'].set_data(qq_x, data['qq_sample'][:points])
+    artists['qq_fit'].set_data(qq_x, data['qq_slope'] * qq_x + data['qq_intercept'])
+    artists['r_squared'].set_text(f"R² = {data['r_squared']:.4f}")
+
+    artists['cdf'].set_data(data['cdf_x'], data['cdf_empirical'])
+    artists['cdf_theory'].set_data(data['cdf_x'], data['cdf_theory'])
+
+    for ax in (ax_hist, ax_time, ax_qq, ax_cdf):
+        ax.relim()
+        ax.autoscale_view()
+
+    # The x-limits of the histogram and CDF follow the curve support only
+    ax_hist.set_xlim(data['pdf_x'][0], data['pdf_x'][-1])
+    ax_cdf.set_xlim(data['cdf_x'][0], data['cdf_x'][-1])
+
+    artists['stats'].set_text(format_stats_text(stats))
+    progress = len(samples) / max_sample_size
+    progress_bar.set_width(progress)
+    progress_text.set_text(f'{progress*100:.1f}%')
+    fig.canvas.draw_idle()
+
+def show_widget_view():
+    """
+    Displays the figure with a play button and a frame slider.
+    With ipympl the live canvas is updated in place; otherwise a single
+    static image is replaced on every change.
+    """
+    setup_artists()
+    play = widgets.Play(min=0, max=num_frames - 1, interval=animation_interval)
+    slider = widgets.IntSlider(min=0, max=num_frames - 1, description='Frame',
+                               continuous_update=True)
+    widgets.jslink((play, 'value'), (slider, 'value'))
+    controls = widgets.HBox([play, slider])
+
+    if ipympl is not None:
+        slider.observe(lambda change: show_frame(change['new']), names='value')
+        show_frame(0)
+        display(widgets.VBox([controls, fig.canvas]))
+    else:
+        image = widgets.Output()
+
+        def redraw(frame):
+            show_frame(frame)
+            with image:
+                image.clear_output(wait=True)
+                display(fig)
+
+        slider.observe(lambda change: redraw(change['new']), names='value')
+        plt.close(fig)  # Shown through the output widget only
+        display(widgets.VBox([controls, image]))
+        redraw(0)
+
 # %% [markdown]
 """
 ## ▶️ Run the Animation
@@ -483,19 +633,24 @@ Execute the cell below to start the interactive animation:
 """
 
 # %%
-# Create and run the animation
-anim = FuncAnimation(fig, update_frame, frames=num_frames, 
-                    interval=animation_interval, blit=False, repeat=False)
+# Widget mode: in-place updates driven by the frame slider
+if notebook_mode == 'widget' and widgets is not None and not save_animation:
+    show_widget_view()
+    print(f"🎛️ Widget mode: drag the slider or press play ({num_frames} frames)")
+else:
+    # Create and run the animation
+    anim = FuncAnimation(fig, update_frame, frames=num_frames, 
+                        interval=animation_interval, blit=False, repeat=False)
 
-# Display initial plots
-plot_histogram(samples, ax_hist, mu, sigma)
-plot_time_series(samples, ax_time)
-plot_qq(samples, ax_qq, mu, sigma)
-plot_cdf(samples, ax_cdf, mu, sigma)
+    # Display initial plots
+    plot_histogram(samples, ax_hist, mu, sigma)
+    plot_time_series(samples, ax_time)
+    plot_qq(samples, ax_qq, mu, sigma)
+    plot_cdf(samples, ax_cdf, mu, sigma)
 
-# Show initial statistics
-initial_stats = calculate_statistics(samples, mu, sigma)
-print(f"🎬 Animation started! Initial KS statistic: {initial_stats['ks_stat']:.4f}")
+    # Show initial statistics
+    initial_stats = calculate_statistics(samples, mu, sigma)
+    print(f"🎬 Animation started! Initial KS statistic: {initial_stats['ks_stat']:.4f}")
 
 # Save animation if requested
 if save_animation:
@@ -518,7 +673,8 @@ After running the animation, analyze the results:
 """
 
 # %%
-# Final analysis
+# Final analysis (last frame of the plan)
+samples = sample_stream[:frame_plan['n'][-1]]
 final_stats = calculate_statistics(samples, mu, sigma)
 
 print("🏁 FINAL ANALYSIS REPORT")
@@ -0,0 +1,315 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Live Streaming Server for the Gaussian Convergence Session
+====================================================================
+
+Runs the session of gaussian_animation.py as a local asyncio HTTP server and
+pushes every frame to any number of browser clients as Server-Sent Events
+(GET /events, read with the browser's EventSource). Only the standard
+library is used - no web framework or websocket package.
+
+Each frame is computed and serialized once; the same encoded payload is then
+handed to every client. Every client has its own small bounded queue drained
+by its own writer task, so a slow client never delays the others: when its
+queue is full the oldest pending frame is dropped (frames are snapshots of
+the whole session, so skipping one loses nothing), and a client whose socket
+stays blocked for longer than client_timeout is disconnected.
+
+Payload (JSON, one per frame):
+    frame, num_frames, n          frame index and sample count
+    hist_counts, hist_edges       histogram counts and bin edges
+    cdf_x, cdf_empirical,         empirical and theoretical CDF on a fixed
+    cdf_theory                    CURVE_POINTS grid
+    stats                         the calculate_statistics dict of the frame
+Undefined values (NaN, e.g. the variance of a single sample) are sent as
+null, so every payload is strict JSON that JSON.parse accepts.
+
+Endpoints:
+    GET /          minimal HTML client (histogram, CDF and statistics)
+    GET /events    the event stream (CORS enabled, so the Next.js dev site
+                   can subscribe from another localhost port)
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+Assignment: 1 - Gaussian Random Variable Distribution (live streaming)
+"""
+
+import asyncio
+import json
+import math
+
+import numpy as np
+
+import gaussian_animation as ga
+
+# =============================================================================
+# USER-CONFIGURABLE PARAMETERS
+# =============================================================================
+
+host = '127.0.0.1'          # Listen address (localhost only by default)
+port = 8765                 # Listen port
+frame_interval = 0.3        # Seconds between frames (animation_interval of the script)
+loop_session = True         # Restart the session after the last frame
+client_queue_size = 8       # Frames buffered per client before the oldest is dropped
+client_timeout = 10.0       # Seconds a blocked client may stall before it is dropped
+
+# =============================================================================
+# PAYLOADS
+# =============================================================================
+
+def _json_number(value, decimals=None):
+    """
+    A float for JSON: rounded if requested, None (null) if not finite.
+    """
+    value = float(value)
+    if not math.isfinite(value):
+        return None
+    return round(value, decimals) if decimals is not None else value
+
+def _json_list(values, decimals=4):
+    return [_json_number(value, decimals) for value in np.asarray(values, dtype=float).tolist()]
+
+def frame_payload(frame, plan, samples, config):
+    """
+    Compact per-frame payload, encoded once as a ready-to-send SSE message.
+    Only the histogram and CDF are computed (no KDE or Q-Q data).
+    """
+    mu_s, sigma_s = config['mu'], config['sigma']
+    data = ga.histogram_bins(samples)
+    data.update(ga.cdf_data(samples, mu_s, sigma_s))
+
+    bins = data['hist_bins']
+    edges = data['hist_edges'][:bins + 1]
+    counts = np.rint(data['hist_density'][:bins] * np.diff(edges) * len(samples))
+
+    payload = {
+        'frame': frame,
+        'num_frames': plan['num_frames'],
+        'n': len(samples),
+        'hist_counts': counts.astype(int).tolist(),
+        'hist_edges': _json_list(edges),
+        'cdf_x': _json_list(data['cdf_x']),
+        'cdf_empirical': _json_list(data['cdf_empirical']),
+        'cdf_theory': _json_list(data['cdf_theory']),
+        'stats': {name: value if isinstance(value, int) else _json_number(value)
+                  for name, value in ga.calculate_statistics(samples, mu_s, sigma_s).items()},
+    }
+    encoded = json.dumps(payload, separators=(',', ':'), allow_nan=False)
+    message = f"id: {frame}\nevent: frame\ndata: {encoded}\n\n"
+    return message.encode()
+
+# =============================================================================
+# BROADCASTER
+# =============================================================================
+
+class Broadcaster:
+    """
+    Fans out encoded messages to the connected clients. Each client owns a
+    bounded queue; a full queue drops its oldest message instead of blocking
+    the producer.
+    """
+
+    def __init__(self, queue_size=client_queue_size):
+        self.queue_size = queue_size
+        self.clients = set()
+        self.latest = None      # Last frame, sent to clients as they join
+        self.dropped = 0        # Messages dropped for slow clients
+
+    def subscribe(self):
+        queue = asyncio.Queue(maxsize=self.queue_size)
+        if self.latest is not None:
+            queue.put_nowait(self.latest)
+        self.clients.add(queue)
+        return queue
+
+    def unsubscribe(self, queue):
+        self.clients.discard(queue)
+
+    def publish(self, message):
+        self.latest = message
+        for queue in self.clients:
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(message)
+
+async def produce_frames(broadcaster, config, interval=frame_interval, loop=loop_session):
+    """
+    Computes the frames of the session in plan order, once each, and
+    publishes them. The computation runs in a worker thread so the event loop
+    keeps serving clients meanwhile.
+    """
+    plan = ga.build_frame_plan(config['initial_sample_size'], config['max_sample_size'],
+                               config['batch_size'])
+    stream = ga.session_stream(config)
+
+    while True:
+        for frame in range(plan['num_frames']):
+            started = asyncio.get_running_loop().time()
+            message = await asyncio.to_thread(frame_payload, frame, plan,
+                                              stream[:plan['n'][frame]], config)
+            broadcaster.publish(message)
+            elapsed = asyncio.get_running_loop().time() - started
+            await asyncio.sleep(max(0.0, interval - elapsed))
+        broadcaster.publish(b"event: done\ndata: {}\n\n")
+        if not loop:
+            return
+
+# =============================================================================
+# HTTP SERVER
+# =============================================================================
+
+SSE_HEADERS = (b"HTTP/1.1 200 OK\r\n"
+               b"Content-Type: text/event-stream\r\n"
+               b"Cache-Control: no-cache\r\n"
+               b"Connection: keep-alive\r\n"
+               b"Access-Control-Allow-Origin: *\r\n\r\n")
+
+CLIENT_PAGE = """<!DOCTYPE html>
+<html><head><meta charset="utf-8"><title>WCOM Lab - Gaussian Stream</title></head>
+<body style="font-family: monospace">
+<h3>WCOM Lab - Gaussian Convergence (live)</h3>
+<canvas id="hist" width="480" height="260"></canvas>
+<canvas id="cdf" width="480" height="260"></canvas>
+<pre id="stats"></pre>
+<script>
+function line(ctx, xs, ys, x0, x1, y1, color) {
+  ctx.strokeStyle = color; ctx.beginPath();
+  xs.forEach((x, i) => {
+    const px = (x - x0) / (x1 - x0) * ctx.canvas.width;
+    const py = ctx.canvas.height * (1 - ys[i] / y1);
+    i ? ctx.lineTo(px, py) : ctx.moveTo(px, py);
+  });
+  ctx.stroke();
+}
+const events = new EventSource('/events');
+events.addEventListener('frame', (e) => {
+  const p = JSON.parse(e.data);
+  const h = document.getElementById('hist').getContext('2d');
+  const c = document.getElementById('cdf').getContext('2d');
+  const x0 = p.hist_edges[0], x1 = p.hist_edges[p.hist_edges.length - 1];
+  const top = Math.max(...p.hist_counts);
+  h.clearRect(0, 0, 480, 260); h.fillStyle = 'skyblue';
+  p.hist_counts.forEach((count, i) => {
+    const left = (p.hist_edges[i] - x0) / (x1 - x0) * 480;
+    const right = (p.hist_edges[i + 1] - x0) / (x1 - x0) * 480;
+    h.fillRect(left, 260 * (1 - count / top), right - left - 1, 260 * count / top);
+  });
+  c.clearRect(0, 0, 480, 260);
+  const cx0 = p.cdf_x[0], cx1 = p.cdf_x[p.cdf_x.length - 1];
+  line(c, p.cdf_x, p.cdf_empirical, cx0, cx1, 1, 'blue');
+  line(c, p.cdf_x, p.cdf_theory, cx0, cx1, 1, 'red');
+  document.getElementById('stats').textContent =
+    `frame ${p.frame + 1}/${p.num_frames}  n = ${p.n}\\n` + JSON.stringify(p.stats, null, 1);
+});
+</script>
+</body></html>
+"""
+
+async def _send_events(reader, writer, queue, timeout):
+    """
+    Writer loop of one client: sends queued messages until the client goes
+    away or stalls for longer than timeout.
+    """
+    writer.write(SSE_HEADERS)
+    closed = asyncio.ensure_future(reader.read())  # Completes when the client disconnects
+    try:
+        while True:
+            next_message = asyncio.ensure_future(queue.get())
+            await asyncio.wait((next_message, closed), return_when=asyncio.FIRST_COMPLETED)
+            if closed.done():
+                next_message.cancel()
+                return
+            writer.write(next_message.result())
+            await asyncio.wait_for(writer.drain(), timeout)
+    finally:
+        closed.cancel()
+
+async def handle_client(reader, writer, broadcaster, timeout=client_timeout):
+    """
+    Minimal HTTP/1.1 handler: GET /events subscribes to the stream, GET /
+    returns the HTML client, anything else is a 404.
+    """
+    try:
+        request_line = await reader.readline()
+        while (await reader.readline()) not in (b'\r\n', b'\n', b''):
+            pass  # Headers are not needed
+        parts = request_line.decode('latin-1').split()
+        path = parts[1] if len(parts) > 1 else ''
+
+        if path.startswith('/events'):
+            queue = broadcaster.subscribe()
+            try:
+                await _send_events(reader, writer, queue, timeout)
+            finally:
+                broadcaster.unsubscribe(queue)
+        else:
+            status, body = (b'200 OK', CLIENT_PAGE.encode()) if path in ('/', '/index.html') \
+                else (b'404 Not Found', b'Not found')
+            writer.write(b"HTTP/1.1 " + status + b"\r\nContent-Type: text/html; charset=utf-8\r\n"
+                         b"Content-Length: " + str(len(body)).encode() + b"\r\n"
+                         b"Connection: close\r\n\r\n" + body)
+            await writer.drain()
+    except (ConnectionError, asyncio.TimeoutError):
+        pass  # Client went away or stalled
+    except asyncio.CancelledError:
+        pass  # Server shutting down: end the handler quietly
+    finally:
+        writer.close()
+
+async def serve(config, host=host, port=port, interval=frame_interval, loop=loop_session,
+                broadcaster=None):
+    """
+    Starts the server and the frame producer. Returns (server, broadcaster,
+    producer task); pass port=0 to pick a free port (see
+    server.sockets[0].getsockname()).
+    """
+    broadcaster = broadcaster or Broadcaster()
+    server = await asyncio.start_server(
+        lambda r, w: handle_client(r, w, broadcaster), host, port)
+    producer = asyncio.create_task(produce_frames(broadcaster, config, interval, loop))
+    return server, broadcaster, producer
+
+async def read_events(host, port, max_events):
+    """
+    Localhost test client: connects to /events and returns the payloads of
+    the first max_events frames (fewer if the stream ends first).
+    """
+    reader, writer = await asyncio.open_connection(host, port)
+    writer.write(b"GET /events HTTP/1.1\r\nHost: localhost\r\n\r\n")
+    await writer.drain()
+    while (await reader.readline()) not in (b'\r\n', b''):
+        pass  # Response headers
+
+    payloads, event = [], None
+    while len(payloads) < max_events:
+        line = (await reader.readline()).decode()
+        if not line:
+            break
+        if line.startswith('event:'):
+            event = line[6:].strip()
+        elif line.startswith('data:') and event == 'frame':
+            payloads.append(json.loads(line[5:]))
+        elif line.startswith('data:') and event == 'done':
+            break
+    writer.close()
+    return payloads
+
+# =============================================================================
+# MAIN SCRIPT
+# =============================================================================
+
+async def main():
+    server, broadcaster, producer = await serve(ga.session_config())
+    print("=" * 60)
+    print("WCOM Lab - Gaussian Convergence Live Stream")
+    print("=" * 60)
+    print(f"Open http://{host}:{port}/ (event stream at /events)")
+    async with server:
+        await asyncio.gather(server.serve_forever(), producer)
+
+if __name__ == "__main__":
+    try:
+        asyncio.run(main())
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,181 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Parameter Sweep of the Gaussian Convergence Session
+=============================================================
+
+Runs the headless session of gaussian_animation.py for every point of a
+(mu, sigma, batch_size) grid in a process pool, one grid point per task, so a
+large sweep uses every core. The final sample buffers of all grid points live
+in a single multiprocessing.shared_memory block: workers write their samples
+straight into their row and only the small per-frame statistics travel back
+through pickling. The results are summarised in a table and a small-multiples
+figure.
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+Assignment: 1 - Gaussian Random Variable Distribution (parameter sweep)
+"""
+
+import itertools
+import os
+from concurrent.futures import ProcessPoolExecutor
+from multiprocessing import shared_memory
+
+import numpy as np
+import scipy.stats as stats
+import matplotlib.pyplot as plt
+
+from gaussian_animation import run_session
+
+# =============================================================================
+# USER-CONFIGURABLE PARAMETERS
+# =============================================================================
+
+# Sweep grid
+sweep_mus = [0.0, 2.0]                  # Means of the normal distribution
+sweep_sigmas = [0.5, 1.0, 2.0]          # Standard deviations
+sweep_batch_sizes = [10, 25, 100]       # Samples added per frame
+
+# Session parameters shared by every grid point
+initial_sample_size = 50    # Initial number of samples
+max_sample_size = 2000      # Maximum number of samples
+random_seed = 42            # Same seed for every grid point (common random numbers)
+max_workers = None          # Worker processes (None = all cores)
+
+# =============================================================================
+# SWEEP
+# =============================================================================
+
+def sweep_configs(mus, sigmas, batch_sizes):
+    """
+    Session configuration of every grid point.
+    """
+    return [{
+        'mu': mu,
+        'sigma': sigma,
+        'initial_sample_size': initial_sample_size,
+        'max_sample_size': max_sample_size,
+        'batch_size': batch_size,
+        'random_seed': random_seed,
+    } for mu, sigma, batch_size in itertools.product(mus, sigmas, batch_sizes)]
+
+def _sweep_worker(task):
+    """
+    Runs one grid point and writes its final samples into row `index` of the
+    shared sample buffer. Returns the per-frame statistics as small columns.
+    """
+    index, config, shm_name, shape = task
+    shm = shared_memory.SharedMemory(name=shm_name)
+    try:
+        buffer = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        session = run_session(config, keep_samples=True)
+        buffer[index, :len(session['samples'])] = session['samples']
+    finally:
+        shm.close()
+
+    columns = {name: np.array([s[name] for s in session['stats']])
+               for name in ('n', 'mean_error', 'var_error', 'ks_stat', 'ks_pvalue')}
+    return index, columns
+
+def run_sweep(configs, max_workers=None):
+    """
+    Runs every configuration in a process pool.
+    Returns (list of per-point statistics columns, samples array of shape
+    (points × max_sample_size)). The samples are copied out of shared memory
+    before it is released.
+    """
+    shape = (len(configs), max(c['max_sample_size'] for c in configs))
+    shm = shared_memory.SharedMemory(create=True, size=int(np.prod(shape)) * 8)
+    try:
+        buffer = np.ndarray(shape, dtype=np.float64, buffer=shm.buf)
+        buffer[:] = np.nan
+
+        results = [None] * len(configs)
+        tasks = [(i, config, shm.name, shape) for i, config in enumerate(configs)]
+        with ProcessPoolExecutor(max_workers=max_workers) as pool:
+            for index, columns in pool.map(_sweep_worker, tasks):
+                results[index] = columns
+
+        samples = buffer.copy()
+        del buffer
+    finally:
+        shm.close()
+        shm.unlink()
+    return results, samples
+
+# =============================================================================
+# REPORTING
+# =============================================================================
+
+def print_sweep_table(configs, results):
+    """
+    Final-frame statistics of every grid point.
+    """
+    print(f"{'mu':>6} {'sigma':>6} {'batch':>6} {'frames':>7} {'mean err':>9} "
+          f"{'var err':>9} {'KS stat':>8} {'KS p':>7}")
+    print("-" * 66)
+    for config, columns in zip(configs, results):
+        print(f"{config['mu']:6.2f} {config['sigma']:6.2f} {config['batch_size']:6d} "
+              f"{len(columns['n']):7d} {columns['mean_error'][-1]:9.4f} "
+              f"{columns['var_error'][-1]:9.4f} {columns['ks_stat'][-1]:8.4f} "
+              f"{columns['ks_pvalue'][-1]:7.4f}")
+
+def plot_sweep(configs, results, samples):
+    """
+    Small multiples: final histogram vs theoretical PDF for every grid point,
+    plus the KS-statistic convergence of all points in one panel.
+    """
+    cols = int(np.ceil(np.sqrt(len(configs) + 1)))
+    rows = int(np.ceil((len(configs) + 1) / cols))
+    fig, axes = plt.subplots(rows, cols, figsize=(3.2 * cols, 2.8 * rows), squeeze=False)
+    fig.suptitle('WCOM Lab: Gaussian Convergence Parameter Sweep\n' +
+                 f'{len(configs)} grid points | n = {initial_sample_size} → {max_sample_size}',
+                 fontsize=14, fontweight='bold')
+    axes = axes.ravel()
+
+    for ax, config, columns, row in zip(axes, configs, results, samples):
+        mu, sigma = config['mu'], config['sigma']
+        final = row[~np.isnan(row)]
+        ax.hist(final, bins=40, density=True, alpha=0.7, color='skyblue',
+                edgecolor='navy', linewidth=0.3)
+        x_range = np.linspace(mu - 4*sigma, mu + 4*sigma, 200)
+        ax.plot(x_range, stats.norm.pdf(x_range, mu, sigma), 'r-', linewidth=1.5)
+        ax.set_title(f"μ={mu}, σ={sigma}, batch={config['batch_size']}", fontsize=9)
+        ax.text(0.03, 0.95, f"KS={columns['ks_stat'][-1]:.3f}", transform=ax.transAxes,
+                verticalalignment='top', fontsize=8,
+                bbox=dict(boxstyle='round', facecolor='wheat', alpha=0.8))
+        ax.tick_params(labelsize=7)
+
+    # Convergence of the KS statistic for every grid point
+    ax_ks = axes[len(configs)]
+    for config, columns in zip(configs, results):
+        ax_ks.plot(columns['n'], columns['ks_stat'], linewidth=1, alpha=0.7)
+    ax_ks.set_title("KS Statistic vs Sample Size", fontsize=9)
+    ax_ks.set_xlabel("Number of Samples", fontsize=8)
+    ax_ks.grid(True, alpha=0.3)
+    ax_ks.tick_params(labelsize=7)
+
+    for ax in axes[len(configs) + 1:]:
+        ax.axis('off')
+
+    plt.tight_layout()
+    return fig
+
+# =============================================================================
+# MAIN SCRIPT
+# =============================================================================
+
+if __name__ == "__main__":
+    configs = sweep_configs(sweep_mus, sweep_sigmas, sweep_batch_sizes)
+    workers = max_workers or os.cpu_count()
+
+    print("=" * 66)
+    print("WCOM Lab - Gaussian Convergence Parameter Sweep")
+    print("=" * 66)
+    print(f"Grid points: {len(configs)} | Workers: {workers}")
+
+    results, samples = run_sweep(configs, max_workers=workers)
+    print_sweep_table(configs, results)
+
+    plot_sweep(configs, results, samples)
+    plt.show()
@@ -0,0 +1,359 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Goodness-of-Fit Test Battery for Gaussian Channel Models
+==================================================================
+
+Extends the single KS test of calculate_statistics with a battery of
+normality tests - Kolmogorov-Smirnov, Anderson-Darling, Cramér-von Mises,
+Shapiro-Wilk and chi-square - evaluated for many replications at once.
+With gof_tests = True in gaussian_animation.py the battery is added to the
+statistics of every frame (calculate_statistics(..., gof=True)).
+
+Every test works on the same sorted samples: each replication (one row of a
+replications × n array) is sorted once, its theoretical CDF values are
+computed once, and all statistics are vectorized over the replication axis.
+Everything that only depends on n or on the test (Shapiro-Wilk coefficients,
+the Cramér-von Mises distribution tables, chi-square critical values and the
+Stephens critical-value table) is computed once and reused.
+
+KS, AD, CvM and chi-square test the fully specified N(mu, sigma) (as the
+animation's KS test does); Shapiro-Wilk tests normality with estimated
+parameters (Royston's approximation, valid for 3 <= n <= 5000).
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+Assignment: 1 - Gaussian Random Variable Distribution (channel-model validation)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import scipy.stats as stats
+from scipy.special import gamma, gammaln, kv, log_ndtr
+
+# =============================================================================
+# USER-CONFIGURABLE PARAMETERS
+# =============================================================================
+
+mu = 0.0                    # Mean of the normal distribution
+sigma = 1.0                 # Standard deviation of the normal distribution
+sample_sizes = [20, 50, 100, 500, 2000]     # Sample sizes of the validation report
+replications = 2000         # Replications per sample size
+alpha = 0.05                # Significance level of the report
+random_seed = 42            # Random seed for reproducibility
+block_elements = 2**21      # Samples processed per block of replications (bounds memory)
+
+TESTS = ('ks', 'ad', 'cvm', 'sw', 'chi2')
+
+# =============================================================================
+# CRITICAL-VALUE TABLES
+# =============================================================================
+
+# Stephens (1974) upper-tail critical values of the modified statistics for a
+# fully specified distribution (case 0), valid for all n >= 5
+STEPHENS_ALPHAS = (0.10, 0.05, 0.025, 0.01)
+STEPHENS_CRITICAL = {
+    'ks': (1.224, 1.358, 1.480, 1.628),     # D·(√n + 0.12 + 0.11/√n)
+    'cvm': (0.347, 0.461, 0.581, 0.743),    # (W² - 0.4/n + 0.6/n²)(1 + 1/n)
+    'ad': (1.933, 2.492, 3.070, 3.857),     # A² (no modification needed for n >= 5)
+}
+
+def _cvm_cdf_inf(w):
+    """
+    Asymptotic CDF of the Cramér-von Mises statistic (Anderson & Darling 1952).
+    """
+    w = np.asarray(w, dtype=np.float64)
+    total = np.zeros_like(w)
+    for k in range(20):
+        y = 4*k + 1
+        q = y**2 / (16*w)
+        total += (np.exp(gammaln(k + 0.5) - gammaln(k + 1)) / (np.pi**1.5 * np.sqrt(w))
+                  * np.sqrt(y) * np.exp(-q) * kv(0.25, q))
+    return np.clip(total, 0.0, 1.0)
+
+def _cvm_psi1(w):
+    """
+    First-order finite-n correction ψ₁ of the Cramér-von Mises CDF
+    (Csörgő & Faraway 1996, eq. 1.10, without its V(w)/12 term).
+    """
+    w = np.asarray(w, dtype=np.float64)
+
+    def ed2(y):
+        z = y**2 / 4
+        return np.exp(-z) * (y/2)**1.5 * (kv(0.25, z) + kv(0.75, z)) / np.sqrt(np.pi)
+
+    def ed3(y):
+        z = y**2 / 4
+        return (np.exp(-z) * (y/2)**2.5 * (2*kv(0.25, z) + 3*kv(0.75, z) - kv(1.25, z))
+                / np.sqrt(np.pi))
+
+    total = np.zeros_like(w)
+    sx = 2 * np.sqrt(w)
+    with np.errstate(over='ignore', invalid='ignore', under='ignore'):
+        for k in range(20):
+            m = 2*k + 1
+            g1, g3 = gamma(k + 0.5), gamma(k + 1.5)
+            a_k = (m * g1 * ed2((4*k + 3) / sx) / (9 * w**0.75)
+                   + g1 * ed3((4*k + 1) / sx) / (72 * w**1.25)
+                   + 2 * (m + 2) * g3 * ed3((4*k + 5) / sx) / (12 * w**1.25)
+                   + 7 * m * g1 * ed2((4*k + 1) / sx) / (144 * w**0.75)
+                   + 7 * m * g1 * ed2((4*k + 5) / sx) / (144 * w**0.75))
+            total -= np.nan_to_num(a_k) / (np.pi * gamma(k + 1))
+    return total
+
+@lru_cache(maxsize=1)
+def cvm_table(points=4000, w_max=4.0):
+    """
+    Tabulated asymptotic CvM CDF V(w) and its finite-n correction ψ₁(w),
+    built once and interpolated for every p-value.
+    """
+    w = np.linspace(w_max / points, w_max, points)
+    return w, _cvm_cdf_inf(w), _cvm_psi1(w)
+
+def _cvm_pvalue(w2, n):
+    """
+    p-value of W² from the finite-n CDF V(w)(1 + 1/(12n)) + ψ₁(w)/n
+    (Csörgő & Faraway 1996, the distribution scipy.stats.cramervonmises
+    uses), on the support [1/(12n), n/3] of W².
+    """
+    w_table, v_table, psi1_table = cvm_table()
+    cdf = (np.interp(w2, w_table, v_table, left=0.0, right=1.0) * (1 + 1/(12*n))
+           + np.interp(w2, w_table, psi1_table, left=0.0, right=0.0) / n)
+    cdf = np.where(w2 <= 1/(12*n), 0.0, np.where(w2 >= n/3, 1.0, cdf))
+    return np.clip(1 - cdf, 0.0, 1.0)
+
+@lru_cache(maxsize=None)
+def chi2_critical(dof, alpha):
+    """
+    Chi-square critical value, cached by degrees of freedom.
+    """
+    return float(stats.chi2.isf(alpha, dof))
+
+@lru_cache(maxsize=None)
+def shapiro_coefficients(n):
+    """
+    Shapiro-Wilk coefficients a_i for sample size n (Royston 1992).
+    """
+    m = stats.norm.ppf((np.arange(1, n + 1) - 0.375) / (n + 0.25))
+    if n == 3:
+        a = np.array([-np.sqrt(0.5), 0.0, np.sqrt(0.5)])
+        return a
+    mm = m @ m
+    u = 1 / np.sqrt(n)
+    a = m / np.sqrt(mm)
+    a_n = a[-1] + 0.221157*u - 0.147981*u**2 - 2.071190*u**3 + 4.434685*u**4 - 2.706056*u**5
+    if n > 5:
+        a_n1 = a[-2] + 0.042981*u - 0.293762*u**2 - 1.752461*u**3 + 5.682633*u**4 - 3.582633*u**5
+        phi = (mm - 2*m[-1]**2 - 2*m[-2]**2) / (1 - 2*a_n**2 - 2*a_n1**2)
+        a = m / np.sqrt(phi)
+        a[-1], a[-2] = a_n, a_n1
+        a[0], a[1] = -a_n, -a_n1
+    else:
+        phi = (mm - 2*m[-1]**2) / (1 - 2*a_n**2)
+        a = m / np.sqrt(phi)
+        a[-1], a[0] = a_n, -a_n
+    return a
+
+def _shapiro_pvalue(w, n):
+    """
+    Royston's normalizing transformation of W.
+    """
+    with np.errstate(divide='ignore', invalid='ignore'):
+        if n == 3:
+            return np.clip(6 / np.pi * (np.arcsin(np.sqrt(w)) - np.arcsin(np.sqrt(0.75))), 0, 1)
+        if n <= 11:
+            gamma = 0.459*n - 2.273
+            m = -0.0006714*n**3 + 0.025054*n**2 - 0.39978*n + 0.5440
+            s = np.exp(-0.0020322*n**3 + 0.062767*n**2 - 0.77857*n + 1.3822)
+            z = (-np.log(gamma - np.log1p(-w)) - m) / s
+        else:
+            ln_n = np.log(n)
+            m = 0.0038915*ln_n**3 - 0.083751*ln_n**2 - 0.31082*ln_n - 1.5861
+            s = np.exp(0.0030302*ln_n**2 - 0.082676*ln_n - 0.4803)
+            z = (np.log1p(-w) - m) / s
+    return stats.norm.sf(z)
+
+def ks_pvalue(d, n):
+    """
+    Two-sided KS p-value: the exact distribution up to 10^4 samples,
+    Kolmogorov's limiting distribution beyond (the exact one costs up to a
+    second per call for n around 10^5-10^6 and agrees to three digits there).
+    """
+    if n <= 10_000:
+        return stats.kstwo.sf(d, n)
+    return stats.kstwobign.sf(np.asarray(d) * np.sqrt(n))
+
+def _ad_pvalue(a2):
+    """
+    Upper-tail p-value of A² from the asymptotic distribution
+    (Marsaglia & Marsaglia 2004).
+    """
+    a2 = np.maximum(np.asarray(a2, dtype=np.float64), 1e-12)
+    with np.errstate(over='ignore'):
+        low = (np.exp(-1.2337141 / a2) / np.sqrt(a2)
+               * (2.00012 + (0.247105 - (0.0649821 - (0.0347962 - (0.011672 - 0.00168691*a2)
+                                                      * a2) * a2) * a2) * a2))
+        high = np.exp(-np.exp(1.0776 - (2.30695 - (0.43424 - (0.082433 - (0.008056 - 0.0003146*a2)
+                                                               * a2) * a2) * a2) * a2))
+    return np.clip(1 - np.where(a2 < 2, low, high), 0.0, 1.0)
+
+# =============================================================================
+# TEST BATTERY
+# =============================================================================
+
+def chi2_bins(n):
+    """
+    Number of equiprobable chi-square bins for sample size n (2·n^0.4 rule).
+    """
+    return max(3, int(round(2 * n**0.4)))
+
+def gof_battery(samples, mu, sigma):
+    """
+    Runs every test on each row of a replications × n array (a 1-D array is
+    one replication). Returns a dict of '<test>_stat' and '<test>_pvalue'
+    arrays with one value per replication.
+    """
+    samples = np.atleast_2d(samples)
+    reps, n = samples.shape
+    results = {f'{test}_{kind}': np.empty(reps) for test in TESTS for kind in ('stat', 'pvalue')}
+    block = max(1, block_elements // max(n, 1))
+    for start in range(0, reps, block):
+        for name, values in _battery_block(samples[start:start + block], mu, sigma).items():
+            results[name][start:start + block] = values
+    return results
+
+def _battery_block(samples, mu, sigma):
+    """
+    All tests for one block of replications, sharing one sort and one CDF
+    evaluation per replication.
+    """
+    reps, n = samples.shape
+    x = np.sort(samples, axis=1)
+    z = (x - mu) / sigma
+    log_cdf = log_ndtr(z)
+    log_sf = log_ndtr(-z)
+    u = np.exp(log_cdf)
+    i = np.arange(1, n + 1)
+
+    # Kolmogorov-Smirnov
+    ks = np.maximum((i / n - u).max(axis=1), (u - (i - 1) / n).max(axis=1))
+
+    # Anderson-Darling: A² = -n - (1/n) Σ (2i-1)[ln u_i + ln(1 - u_(n+1-i))]
+    ad = -n - ((2*i - 1) * (log_cdf + log_sf[:, ::-1])).sum(axis=1) / n
+
+    # Cramér-von Mises: W² = 1/(12n) + Σ (u_i - (2i-1)/(2n))²
+    dev = u - (2*i - 1) / (2*n)
+    cvm = 1 / (12*n) + np.einsum('ij,ij->i', dev, dev)
+    cvm_p = _cvm_pvalue(cvm, n)
+
+    # Shapiro-Wilk (composite: mean and variance estimated)
+    if 3 <= n <= 5000:
+        centred = x - x.mean(axis=1, keepdims=True)
+        sw = (x @ shapiro_coefficients(n))**2 / np.einsum('ij,ij->i', centred, centred)
+        sw = np.minimum(sw, 1.0)
+        sw_p = _shapiro_pvalue(sw, n)
+    else:
+        sw = sw_p = np.full(reps, np.nan)
+
+    # Chi-square with k equiprobable bins under N(mu, sigma)
+    k = chi2_bins(n)
+    bins = np.minimum((u * k).astype(np.intp), k - 1)
+    counts = np.bincount((bins + (np.arange(reps) * k)[:, None]).ravel(),
+                         minlength=reps * k).reshape(reps, k)
+    expected = n / k
+    chi2 = ((counts - expected)**2).sum(axis=1) / expected
+
+    return {
+        'ks_stat': ks, 'ks_pvalue': ks_pvalue(ks, n),
+        'ad_stat': ad, 'ad_pvalue': _ad_pvalue(ad),
+        'cvm_stat': cvm, 'cvm_pvalue': cvm_p,
+        'sw_stat': sw, 'sw_pvalue': sw_p,
+        'chi2_stat': chi2, 'chi2_pvalue': stats.chi2.sf(chi2, k - 1),
+    }
+
+def gof_statistics(samples, mu, sigma):
+    """
+    The battery for a single sample, as a dict of floats - the same form as
+    calculate_statistics, which merges it in with gof=True.
+    """
+    return {name: float(values[0]) for name, values in gof_battery(samples, mu, sigma).items()}
+
+# =============================================================================
+# VALIDATION REPORT
+# =============================================================================
+
+def validation_report(mu, sigma, sample_sizes, replications, alpha=0.05, seed=None,
+                      sampler=None):
+    """
+    Rejection rate of every test at level alpha for every sample size.
+    Under the null hypothesis (the default Gaussian sampler) the rates should
+    be close to alpha. sampler(rng, shape) can draw from another channel
+    model to measure the power of the tests instead.
+    Returns {n: {test: rejection rate}}.
+    """
+    rng = np.random.default_rng(seed)
+    if sampler is None:
+        sampler = lambda rng, shape: rng.normal(mu, sigma, shape)
+
+    report = {}
+    for n in sample_sizes:
+        results = gof_battery(sampler(rng, (replications, n)), mu, sigma)
+        report[n] = {test: float(np.mean(rejected)) for test, rejected in
+                     rejections(results, n, alpha).items()}
+    return report
+
+def rejections(results, n, alpha):
+    """
+    Rejection decisions of every test at level alpha. The Stephens table and
+    the cached chi-square critical values are used where they cover alpha,
+    the p-values otherwise.
+    """
+    decisions = {test: results[f'{test}_pvalue'] < alpha for test in TESTS}
+    if alpha in STEPHENS_ALPHAS:
+        column = STEPHENS_ALPHAS.index(alpha)
+        modified = {
+            'ks': results['ks_stat'] * (np.sqrt(n) + 0.12 + 0.11/np.sqrt(n)),
+            'cvm': (results['cvm_stat'] - 0.4/n + 0.6/n**2) * (1 + 1/n),
+            'ad': results['ad_stat'],
+        }
+        for test, statistic in modified.items():
+            decisions[test] = statistic > STEPHENS_CRITICAL[test][column]
+    decisions['chi2'] = results['chi2_stat'] > chi2_critical(chi2_bins(n) - 1, alpha)
+    return decisions
+
+def print_report(report, alpha):
+    """
+    Rejection-rate table of a validation report.
+    """
+    print(f"{'n':>6} " + " ".join(f"{test.upper():>7}" for test in TESTS))
+    print("-" * (7 + 8 * len(TESTS)))
+    for n, rates in report.items():
+        print(f"{n:6d} " + " ".join(f"{rates[test]:7.3f}" for test in TESTS))
+    print(f"(rejection rate at α = {alpha}; critical values at α = 0.05: "
+          f"KS* {STEPHENS_CRITICAL['ks'][1]}, CvM* {STEPHENS_CRITICAL['cvm'][1]}, "
+          f"AD {STEPHENS_CRITICAL['ad'][1]})")
+
+# =============================================================================
+# MAIN SCRIPT
+# =============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    print("=" * 60)
+    print("WCOM Lab - Goodness-of-Fit Validation Report")
+    print("=" * 60)
+    print(f"N(μ={mu}, σ={sigma}) | {replications} replications per sample size")
+
+    t0 = time.perf_counter()
+    report = validation_report(mu, sigma, sample_sizes, replications, alpha, random_seed)
+    print(f"\nSize under H0 (Gaussian samples), {time.perf_counter() - t0:.2f} s:")
+    print_report(report, alpha)
+
+    # Power against a heavier-tailed channel (Student-t, 5 dof, unit variance)
+    t0 = time.perf_counter()
+    heavy_tailed = lambda rng, shape: mu + sigma * rng.standard_t(5, shape) / np.sqrt(5 / 3)
+    report = validation_report(mu, sigma, sample_sizes, replications, alpha, random_seed,
+                               sampler=heavy_tailed)
+    print(f"\nPower against Student-t (5 dof), {time.perf_counter() - t0:.2f} s:")
+    print_report(report, alpha)
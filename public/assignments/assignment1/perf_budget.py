@@ -0,0 +1,297 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Performance Budget Harness for the Gaussian Toolkit
+=============================================================
+
+Runs a fixed set of canonical workloads and compares their wall time, peak
+resident memory and frame rate against the stored baseline in
+perf_baseline.json. The command exits with status 1 when a workload
+exceeds its budget (baseline × tolerance), so it can gate changes:
+
+    python perf_budget.py                       check every workload
+    python perf_budget.py session_1e4 export_500     check selected workloads
+    python perf_budget.py --update-baseline     re-measure and store the baseline
+
+Every workload runs in a fresh child process, so its peak RSS (from the
+resource module) is its own and not the maximum of everything run before.
+
+The Gaussian sessions run the exact backend at 10^4 and 10^6 samples and the
+KLL sketch backend at 10^6 and 10^7 (the exact backend keeps every sample
+and recomputes the KDE per frame, so it is budgeted with fewer frames at
+10^6 and not at all at 10^7). export_500 is the script's headless export of
+a 500-frame plan: every frame goes through render_frame and anim.save (GIF,
+pillow writer) on the Agg backend, with the binary snapshots written too.
+
+The animation_script workload also checks the script's own printout against
+the playback measured here: the "Animation duration: ~X seconds" estimate
+must lie within duration_tolerance of it, and the script's closing
+"Playback:" figure within playback_tolerance.
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+Assignment: 1 - Gaussian Random Variable Distribution (performance budgets)
+"""
+
+import argparse
+import json
+import os
+import re
+import subprocess
+import sys
+import tempfile
+import time
+
+# =============================================================================
+# USER-CONFIGURABLE PARAMETERS
+# =============================================================================
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'perf_baseline.json')
+time_tolerance = 1.5        # Budget: wall time may grow to baseline × this (fps drop to 1/this)
+rss_tolerance = 1.25        # Budget: peak RSS may grow to baseline × this
+duration_tolerance = 0.20   # Allowed relative error of the printed animation duration
+playback_tolerance = 0.05   # Allowed relative error of the script's playback report
+export_dpi = 50             # GIF resolution of export_500 (the pillow writer keeps every frame)
+
+# =============================================================================
+# WORKLOADS
+# =============================================================================
+# Each workload returns (number of frames, extra report fields) and is timed
+# by run_workload in its own process.
+
+def _session(max_samples, frames, backend, keep_frames):
+    """
+    Headless session of max_samples samples in `frames` frames.
+    """
+    import gaussian_animation as ga
+
+    config = dict(ga.session_config(), initial_sample_size=50, max_sample_size=max_samples,
+                  batch_size=max(1, (max_samples - 50) // frames), quantile_backend=backend)
+    session = ga.run_session(config, keep_frames=keep_frames)
+    return len(session['stats']), {'final_ks': float(session['stats'][-1]['ks_stat'])}
+
+def _run_script(show, save_dpi=None, **parameters):
+    """
+    Runs gaussian_animation.py as a script on the Agg backend, with the given
+    user-configurable parameters replaced; plt.show is replaced by
+    show(anim, fig, func, frames, interval), called with the script's
+    FuncAnimation, and anim.save writes at save_dpi when it is given.
+    Returns show's return value and the script's printout.
+    """
+    import contextlib
+    import io
+    import matplotlib
+    matplotlib.use('Agg')
+    import matplotlib.animation
+    import matplotlib.pyplot as plt
+
+    animations = []
+    result = []
+
+    class RecordedAnimation(matplotlib.animation.FuncAnimation):
+        def __init__(self, fig, func, frames=None, **kwargs):
+            super().__init__(fig, func, frames=frames, **kwargs)
+            animations.append((self, fig, func, frames, kwargs.get('interval', 200)))
+
+        def save(self, *args, **kwargs):
+            if save_dpi is not None:
+                kwargs.setdefault('dpi', save_dpi)
+            return super().save(*args, **kwargs)
+
+    def recorded_show(*args, **kwargs):
+        result.append(show(*animations[-1]))
+
+    path = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'gaussian_animation.py')
+    with open(path, encoding='utf-8') as f:
+        source = f.read()
+    for name, value in parameters.items():
+        source, count = re.subn(rf"^{name} = [^#\n]*", f"{name} = {value!r} ", source,
+                                flags=re.MULTILINE)
+        if count != 1:
+            raise ValueError(f"gaussian_animation.py has no parameter {name}")
+
+    original = matplotlib.animation.FuncAnimation, plt.show
+    matplotlib.animation.FuncAnimation, plt.show = RecordedAnimation, recorded_show
+    output = io.StringIO()
+    try:
+        with contextlib.redirect_stdout(output):
+            exec(compile(source, path, 'exec'), {'__name__': '__main__', '__file__': path})
+    finally:
+        matplotlib.animation.FuncAnimation, plt.show = original
+    return result[-1], output.getvalue()
+
+def _animation_script():
+    """
+    Plays every frame of the script at the animation interval, drawing each
+    one. Returns the script's printed duration and playback report next to
+    the measured playback time.
+    """
+    def play(anim, fig, func, frames, interval):
+        # Frames are shown every interval ms, or as soon as a slower draw ends
+        start = time.perf_counter()
+        for frame in range(frames):
+            frame_start = time.perf_counter()
+            func(frame)
+            fig.canvas.draw()
+            time.sleep(max(0.0, interval / 1000 - (time.perf_counter() - frame_start)))
+        return frames, time.perf_counter() - start
+
+    (frames, playback), output = _run_script(play)
+    claimed = re.search(r"Animation duration: ~([\d.]+) seconds", output)
+    reported = re.search(r"Playback: \d+ frames in ~([\d.]+) seconds", output)
+    return frames, {'claimed_duration_s': float(claimed.group(1)) if claimed else None,
+                    'reported_playback_s': float(reported.group(1)) if reported else None,
+                    'playback_s': playback}
+
+def _export(frames):
+    """
+    The script's save_animation export of a `frames`-frame plan (GIF and
+    binary snapshots), written to a temporary directory.
+    """
+    cwd = os.getcwd()
+    with tempfile.TemporaryDirectory() as tmp:
+        os.chdir(tmp)  # The script writes its exports to the working directory
+        try:
+            (count, _), _ = _run_script(lambda anim, fig, func, frames, interval: (frames, None),
+                                        save_dpi=export_dpi, initial_sample_size=50, batch_size=25,
+                                        max_sample_size=50 + 25 * frames,
+                                        save_animation=True, export_snapshots=True)
+            sizes = {name: os.path.getsize(name) for name in os.listdir(tmp)}
+        finally:
+            os.chdir(cwd)
+    if 'wcom_gaussian_animation.gif' not in sizes:
+        raise RuntimeError("The animation export wrote no GIF")
+    return count, {'gif_bytes': sizes['wcom_gaussian_animation.gif'],
+                   'snapshot_bytes': sizes.get('wcom_gaussian_frames.wcsn', 0)}
+
+WORKLOADS = {
+    'session_1e4': lambda: _session(10**4, 40, 'exact', keep_frames=True),
+    'session_1e6_exact': lambda: _session(10**6, 10, 'exact', keep_frames=True),
+    'session_1e6': lambda: _session(10**6, 40, 'kll', keep_frames=True),
+    'session_1e7': lambda: _session(10**7, 40, 'kll', keep_frames=True),
+    'stats_only_1e6': lambda: _session(10**6, 20, 'exact', keep_frames=False),
+    'export_500': lambda: _export(500),
+    'animation_script': _animation_script,
+}
+
+# =============================================================================
+# MEASUREMENT
+# =============================================================================
+
+def run_workload(name):
+    """
+    Runs one workload in this process and returns its measurements.
+    """
+    import resource
+
+    start = time.perf_counter()
+    frames, extra = WORKLOADS[name]()
+    wall = time.perf_counter() - start
+    peak_rss_mb = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024  # kB on Linux
+    if sys.platform == 'darwin':
+        peak_rss_mb /= 1024  # macOS reports bytes
+    return dict({'wall_s': wall, 'peak_rss_mb': peak_rss_mb, 'frames': frames,
+                 'fps': frames / wall if wall > 0 else float('inf')}, **extra)
+
+def measure(name):
+    """
+    Runs one workload in a fresh child process.
+    """
+    result = subprocess.run([sys.executable, os.path.abspath(__file__), '--child', name],
+                            capture_output=True, text=True,
+                            env=dict(os.environ, MPLBACKEND='Agg'))
+    if result.returncode != 0:
+        raise RuntimeError(f"Workload {name} failed:\n{result.stderr}")
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+def check_budget(name, measured, baseline):
+    """
+    List of budget violations of one workload (empty when within budget).
+    """
+    failures = []
+    if baseline is not None:
+        if measured['wall_s'] > baseline['wall_s'] * time_tolerance:
+            failures.append(f"wall time {measured['wall_s']:.2f} s > "
+                            f"{baseline['wall_s'] * time_tolerance:.2f} s")
+        if measured['peak_rss_mb'] > baseline['peak_rss_mb'] * rss_tolerance:
+            failures.append(f"peak RSS {measured['peak_rss_mb']:.0f} MB > "
+                            f"{baseline['peak_rss_mb'] * rss_tolerance:.0f} MB")
+        if measured['fps'] < baseline['fps'] / time_tolerance:
+            failures.append(f"{measured['fps']:.1f} fps < {baseline['fps'] / time_tolerance:.1f} fps")
+    if 'playback_s' in measured:
+        for field, label, tolerance in (('claimed_duration_s', 'printed duration', duration_tolerance),
+                                        ('reported_playback_s', 'reported playback',
+                                         playback_tolerance)):
+            if measured[field] is None:
+                failures.append(f"no {label} in the script's output")
+                continue
+            error = abs(measured[field] - measured['playback_s']) / measured['playback_s']
+            if error > tolerance:
+                failures.append(f"{label} ~{measured[field]:.1f} s is {error:.0%} off the "
+                                f"measured playback {measured['playback_s']:.1f} s")
+    return failures
+
+# =============================================================================
+# MAIN SCRIPT
+# =============================================================================
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="WCOM Lab performance budget check")
+    parser.add_argument('workloads', nargs='*', help="workloads to run (default: all)")
+    parser.add_argument('--update-baseline', action='store_true',
+                        help="store the measurements as the new baseline")
+    parser.add_argument('--child', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        print(json.dumps(run_workload(args.child)))
+        sys.exit(0)
+
+    names = args.workloads or list(WORKLOADS)
+    unknown = sorted(set(names) - set(WORKLOADS))
+    if unknown:
+        parser.error(f"unknown workloads: {', '.join(unknown)}")
+
+    baseline = {'workloads': {}}
+    if os.path.exists(BASELINE_PATH):
+        with open(BASELINE_PATH) as f:
+            baseline = json.load(f)
+
+    print("=" * 72)
+    print("WCOM Lab - Performance Budgets")
+    print("=" * 72)
+    print(f"{'workload':18s} {'wall (s)':>9} {'budget':>8} {'RSS (MB)':>9} {'budget':>8} "
+          f"{'fps':>8} {'status':>7}")
+
+    results, failed = {}, False
+    for name in names:
+        measured = measure(name)
+        results[name] = measured
+        reference = baseline['workloads'].get(name)
+        failures = [] if args.update_baseline else check_budget(name, measured, reference)
+        failed |= bool(failures)
+
+        wall_budget = f"{reference['wall_s'] * time_tolerance:8.2f}" if reference else f"{'-':>8}"
+        rss_budget = f"{reference['peak_rss_mb'] * rss_tolerance:8.0f}" if reference else f"{'-':>8}"
+        print(f"{name:18s} {measured['wall_s']:9.2f} {wall_budget} {measured['peak_rss_mb']:9.0f} "
+              f"{rss_budget} {measured['fps']:8.1f} {'FAIL' if failures else 'ok':>7}")
+        if 'playback_s' in measured:
+            claimed, reported = measured['claimed_duration_s'], measured['reported_playback_s']
+            print(f"    playback {measured['playback_s']:.1f} s (printed duration "
+                  f"{'-' if claimed is None else f'{claimed:.1f}'} s, script reports "
+                  f"{'-' if reported is None else f'{reported:.1f}'} s)")
+        for failure in failures:
+            print(f"    {failure}")
+
+    if args.update_baseline:
+        baseline['workloads'].update({name: {key: round(value, 4) for key, value in result.items()
+                                             if key in ('wall_s', 'peak_rss_mb', 'fps')}
+                                      for name, result in results.items()})
+        baseline['workloads'] = {name: entry for name, entry in baseline['workloads'].items()
+                                 if name in WORKLOADS}
+        baseline['machine'] = f"{os.cpu_count()} CPU(s), Python {sys.version.split()[0]}"
+        with open(BASELINE_PATH, 'w') as f:
+            json.dump(baseline, f, indent=2, sort_keys=True)
+            f.write('\n')
+        print(f"\nBaseline written to {BASELINE_PATH}")
+
+    sys.exit(1 if failed else 0)
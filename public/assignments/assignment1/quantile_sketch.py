@@ -0,0 +1,326 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Mergeable Quantile Sketch (KLL) for Unbounded Sample Streams
+======================================================================
+
+The exact CDF, Q-Q plot and KS test of gaussian_animation.py sort every sample
+seen so far. For long or unbounded streams this sketch keeps a small,
+bounded summary instead: a KLL sketch (Karnin, Lang & Liberty, 2016) holds
+O(k log(n/k)) weighted items, answers CDF and quantile queries, gives an
+approximate KS statistic, and merges with sketches built by other workers.
+
+Error bound: every compaction of a level with item weight w shifts any rank
+query by -w, 0 or +w with zero mean, independently of the others. Tracking
+the sum of w² over all compactions gives a Hoeffding bound on the CDF error
+that holds for any query with probability 1 - delta:
+
+    |F_sketch(x) - F_samples(x)| <= sqrt(2 · Σw² · ln(2/delta)) / n
+
+Running moments (count, mean, M2, peak power) are tracked alongside, so the
+session statistics can be computed without keeping the samples.
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+"""
+
+import numpy as np
+import scipy.stats as stats
+
+from gaussian_animation import (MAX_HIST_BINS, CURVE_POINTS, QQ_POINTS, curve_support,
+                                histogram_bin_count, theory_curves)
+from goodness_of_fit import ks_pvalue
+from signal_metrics import to_db
+
+# =============================================================================
+# KLL SKETCH
+# =============================================================================
+
+class KLLSketch:
+    """
+    KLL quantile sketch with running moments.
+
+    k sets the accuracy (typical normalised rank error ~ 1/k); c is the
+    geometric capacity decay between levels.
+    """
+
+    def __init__(self, k=200, c=2/3, seed=None):
+        self.k = k
+        self.c = c
+        self.rng = np.random.default_rng(seed)
+        self.levels = [np.empty(0)]
+        self.error_var = 0.0     # Σw² over all compactions
+        self.n = 0
+        self.mean = 0.0
+        self.m2 = 0.0            # Sum of squared deviations from the mean
+        self.min = np.inf
+        self.max = -np.inf
+        self.peak_power = 0.0
+
+    # -------------------------------------------------------------------------
+    # Updates
+    # -------------------------------------------------------------------------
+
+    def _capacity(self, level):
+        depth = len(self.levels) - 1 - level
+        return max(2, int(np.ceil(self.k * self.c**depth)))
+
+    def _update_moments(self, n_b, mean_b, m2_b, min_b, max_b, peak_b):
+        """
+        Chan et al. parallel update of count, mean and M2.
+        """
+        n = self.n + n_b
+        delta = mean_b - self.mean
+        self.mean += delta * n_b / n
+        self.m2 += m2_b + delta**2 * self.n * n_b / n
+        self.n = n
+        self.min = min(self.min, min_b)
+        self.max = max(self.max, max_b)
+        self.peak_power = max(self.peak_power, peak_b)
+
+    def update(self, values):
+        """
+        Adds a batch of samples.
+        """
+        values = np.asarray(values, dtype=np.float64).ravel()
+        if len(values) == 0:
+            return self
+        batch_mean = values.mean()
+        centred = values - batch_mean
+        v_min, v_max = values.min(), values.max()
+        self._update_moments(len(values), batch_mean, np.dot(centred, centred),
+                             v_min, v_max, max(v_min**2, v_max**2))
+        self.levels[0] = np.concatenate((self.levels[0], values))
+        self._compress()
+        return self
+
+    def _compress(self):
+        """
+        Compacts every level that exceeds its capacity: the sorted buffer keeps
+        every other item (random offset) at twice the weight one level up.
+        """
+        level = 0
+        while level < len(self.levels):
+            buffer = self.levels[level]
+            if len(buffer) > self._capacity(level):
+                if level + 1 == len(self.levels):
+                    self.levels.append(np.empty(0))
+                buffer = np.sort(buffer)
+                # An odd item out stays at this level
+                leftover = buffer[-1:] if len(buffer) % 2 else buffer[:0]
+                paired = buffer[:len(buffer) - len(leftover)]
+                promoted = paired[self.rng.integers(0, 2)::2]
+                self.levels[level] = leftover.copy()
+                self.levels[level + 1] = np.concatenate((self.levels[level + 1], promoted))
+                self.error_var += float(2**level)**2
+            level += 1
+
+    def merge(self, other):
+        """
+        Merges another sketch (e.g. from a parallel worker) into this one.
+        """
+        if other.n == 0:
+            return self
+        self._update_moments(other.n, other.mean, other.m2, other.min, other.max,
+                             other.peak_power)
+        while len(self.levels) < len(other.levels):
+            self.levels.append(np.empty(0))
+        for level, buffer in enumerate(other.levels):
+            self.levels[level] = np.concatenate((self.levels[level], buffer))
+        self.error_var += other.error_var
+        self._compress()
+        return self
+
+    # -------------------------------------------------------------------------
+    # Queries
+    # -------------------------------------------------------------------------
+
+    def _sorted_items(self):
+        """
+        All retained items sorted, with their cumulative weights.
+        """
+        items = np.concatenate(self.levels)
+        weights = np.concatenate([np.full(len(b), 2.0**h) for h, b in enumerate(self.levels)])
+        order = np.argsort(items, kind='stable')
+        return items[order], np.cumsum(weights[order])
+
+    def size(self):
+        """
+        Number of retained items (the memory footprint of the sketch).
+        """
+        return sum(len(b) for b in self.levels)
+
+    def cdf(self, x):
+        """
+        Approximate empirical CDF at x.
+        """
+        items, cum_weights = self._sorted_items()
+        pos = np.searchsorted(items, x, side='right')
+        return np.where(pos > 0, cum_weights[np.maximum(pos - 1, 0)], 0.0) / self.n
+
+    def quantile(self, q):
+        """
+        Approximate q-quantile(s), 0 <= q <= 1.
+        """
+        items, cum_weights = self._sorted_items()
+        pos = np.searchsorted(cum_weights, np.asarray(q) * self.n, side='left')
+        return items[np.minimum(pos, len(items) - 1)]
+
+    def error_bound(self, delta=0.01):
+        """
+        CDF error that holds with probability 1 - delta for any single query.
+        """
+        if self.n == 0:
+            return 0.0
+        return np.sqrt(2 * self.error_var * np.log(2 / delta)) / self.n
+
+    def ks_test(self, mu, sigma, delta=0.01):
+        """
+        Approximate one-sample KS test against N(mu, sigma^2).
+        Returns (D, p-value, bound): D = max(F_sketch - F, F - F_sketch⁻) over
+        the sketch steps, which is the exact D while nothing has been
+        compacted; the true D lies within ± bound of it with probability about
+        1 - delta. The p-value is conservative: it is the one of
+        max(D - bound, 0), the smallest D the samples can have (1 when D is
+        within the bound, exact when bound is 0).
+        """
+        items, cum_weights = self._sorted_items()
+        upper = cum_weights / self.n
+        lower = np.concatenate(([0.0], upper[:-1]))
+        theory = stats.norm.cdf(items, mu, sigma)
+        d_stat = max(np.max(upper - theory), np.max(theory - lower))
+        bound = self.error_bound(delta)
+        return d_stat, float(ks_pvalue(max(d_stat - bound, 0.0), self.n)), bound
+
+# =============================================================================
+# SESSION STATISTICS FROM A SKETCH
+# =============================================================================
+
+def sketch_statistics(sketch, mu, sigma):
+    """
+    The calculate_statistics dict of gaussian_animation.py, computed from the
+    sketch and its running moments instead of the samples.
+    """
+    n = sketch.n
+    emp_var = sketch.m2 / (n - 1) if n > 1 else np.nan
+    emp_std = np.sqrt(emp_var)
+    ks_stat, ks_pvalue, _ = sketch.ks_test(mu, sigma)
+    avg_power = sketch.m2 / n + sketch.mean**2
+
+    return {
+        'n': n,
+        'emp_mean': sketch.mean,
+        'emp_var': emp_var,
+        'emp_std': emp_std,
+        'mean_error': abs(sketch.mean - mu),
+        'var_error': abs(emp_var - sigma**2),
+        'ks_stat': ks_stat,
+        'ks_pvalue': ks_pvalue,
+        'snr_db': to_db(abs(sketch.mean) / emp_std, 20) if emp_std > 0 else float('nan'),
+        'papr_db': to_db(sketch.peak_power / avg_power) if avg_power > 0 else float('nan'),
+    }
+
+def sketch_frame_data(sketch, mu, sigma):
+    """
+    The compute_frame_data dict of gaussian_animation.py (histogram, Q-Q and
+    CDF panels) read off the sketch. The KDE curve is not available.
+    """
+    n = sketch.n
+
+    # Histogram densities from CDF differences over equal-width bins
+    bins = histogram_bin_count(n)
+    edges = np.linspace(sketch.min, sketch.max, bins + 1)
+    cdf_edges = sketch.cdf(edges)
+    cdf_edges[0], cdf_edges[-1] = 0.0, 1.0
+    hist_density = np.full(MAX_HIST_BINS, np.nan)
+    hist_edges = np.full(MAX_HIST_BINS + 1, np.nan)
+    hist_density[:bins] = np.diff(cdf_edges) / np.diff(edges)
+    hist_edges[:bins + 1] = edges
+    pdf_x, theory_pdf, theory_cdf = theory_curves(
+        mu, sigma, curve_support(sketch.min, sketch.max, mu, sigma))
+
+    # Q-Q quantiles at the plotting positions of min(n, QQ_POINTS) points
+    points = min(n, QQ_POINTS)
+    probabilities = (np.arange(1, points + 1) - 0.5) / points
+    qq_theoretical = np.full(QQ_POINTS, np.nan)
+    qq_sample = np.full(QQ_POINTS, np.nan)
+    qq_theoretical[:points] = stats.norm.ppf(probabilities, mu, sigma)
+    qq_sample[:points] = sketch.quantile(probabilities)
+    slope, intercept = np.polyfit(qq_theoretical[:points], qq_sample[:points], 1)
+    levels = np.linspace(0.01, 0.99, points)
+    r_squared = np.corrcoef(stats.norm.ppf(levels, mu, sigma), sketch.quantile(levels))[0, 1]**2
+
+    return {
+        'hist_bins': bins,
+        'hist_density': hist_density,
+        'hist_edges': hist_edges,
+        'pdf_x': pdf_x,
+        'theory_pdf': theory_pdf,
+        'kde_pdf': np.full(CURVE_POINTS, np.nan),
+        'qq_points': points,
+        'qq_theoretical': qq_theoretical,
+        'qq_sample': qq_sample,
+        'qq_slope': slope,
+        'qq_intercept': intercept,
+        'r_squared': r_squared,
+        'cdf_x': pdf_x,
+        'cdf_empirical': sketch.cdf(pdf_x),
+        'cdf_theory': theory_cdf,
+    }
+
+# =============================================================================
+# DEMONSTRATION
+# =============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    mu, sigma = 0.0, 1.0
+    n_total = 10_000_000
+    num_workers = 4
+    rng = np.random.default_rng(42)
+    samples = rng.normal(mu, sigma, n_total)
+
+    print("=" * 60)
+    print("WCOM Lab - KLL Quantile Sketch vs Exact Sorted Path")
+    print("=" * 60)
+
+    # Each "worker" sketches its share of the stream in batches; then merge
+    t0 = time.perf_counter()
+    sketches = []
+    for part in np.array_split(samples, num_workers):
+        sketch = KLLSketch(k=400, seed=len(sketches))
+        for batch in np.array_split(part, 100):
+            sketch.update(batch)
+        sketches.append(sketch)
+    merged = sketches[0]
+    for sketch in sketches[1:]:
+        merged.merge(sketch)
+    t_sketch = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    exact_d, exact_p = stats.kstest(samples, 'norm', args=(mu, sigma))
+    t_exact = time.perf_counter() - t0
+
+    d_stat, p_value, bound = merged.ks_test(mu, sigma)
+
+    # Before any compaction the sketch test is the exact test
+    small = samples[:150]
+    small_sketch = KLLSketch(k=400)
+    small_sketch.update(small)
+    small_d, small_p, _ = small_sketch.ks_test(mu, sigma)
+    reference_d, reference_p = stats.kstest(small, 'norm', args=(mu, sigma))
+    x_grid = np.linspace(-3, 3, 61)
+    exact_cdf = np.searchsorted(np.sort(samples), x_grid, side='right') / n_total
+
+    print(f"Samples: {n_total:,} in {num_workers} merged sketches")
+    print(f"Retained items: {merged.size():,} ({merged.size() * 8 / 1024:.1f} KiB)")
+    print(f"Max CDF error on grid: {np.max(np.abs(merged.cdf(x_grid) - exact_cdf)):.2e} "
+          f"(99% bound: {merged.error_bound():.2e})")
+    print(f"KS D: sketch {d_stat:.5f} ± {bound:.5f} | exact {exact_d:.5f}")
+    print(f"KS p-value: sketch {p_value:.4f} (conservative) | exact {exact_p:.4f}")
+    print(f"Uncompacted (n = {len(small)}): D {small_d:.5f} vs kstest {reference_d:.5f}, "
+          f"p {small_p:.4f} vs kstest {reference_p:.4f}")
+    print(f"Median: sketch {merged.quantile(0.5):.4f} | exact {np.median(samples):.4f}")
+    print(f"Mean/std: sketch {merged.mean:.5f}/{np.sqrt(merged.m2 / (n_total - 1)):.5f} | "
+          f"exact {samples.mean():.5f}/{samples.std(ddof=1):.5f}")
+    print(f"Time: sketch (incl. merge) {t_sketch:.2f} s | exact KS {t_exact:.2f} s")
@@ -0,0 +1,249 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Columnar Result Store for Gaussian Animation Runs
+===========================================================
+
+Stores the per-frame statistics of a session (the calculate_statistics dicts)
+as columns - one array per statistic, one row per frame - together with the
+optional raw samples. Runs are keyed by a hash of the session configuration
+(distribution parameters, sample sizes and seed), so re-running an identical
+configuration loads the stored results instead of recomputing them.
+
+Storage format:
+    <RESULTS_DIR>/<key>/config.json     configuration of the run
+    <RESULTS_DIR>/<key>/stats.parquet   per-frame statistics (if pyarrow is installed)
+    <RESULTS_DIR>/<key>/stats.npz       per-frame statistics (compressed NumPy fallback)
+    <RESULTS_DIR>/<key>/samples.npz     raw samples (optional)
+    <RESULTS_DIR>/<key>/frames/         per-frame drawing data for replay (optional):
+                                        one (frames × width) array per field, memory-
+                                        mapped on load so any frame is read on demand
+
+Old runs are evicted by age and/or total store size, least recently used first.
+The store lives in the user cache directory (~/.cache/wcom_lab/runs, beside
+the assignment 3 propagation_tables cache) unless WCOM_RESULTS_DIR is set, so
+every working directory shares it and no run data lands in the course site.
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+"""
+
+import hashlib
+import json
+import os
+import shutil
+import time
+
+import numpy as np
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+except ImportError:  # Parquet is optional; fall back to compressed .npz
+    pa = None
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+RESULTS_DIR = os.environ.get('WCOM_RESULTS_DIR',
+                             os.path.join(os.path.expanduser('~'), '.cache', 'wcom_lab', 'runs'))
+STORE_VERSION = 4               # Bump when the stored columns change
+MAX_STORE_BYTES = 512 * 2**20   # Evict least recently used runs above this size
+MAX_AGE_DAYS = 30               # Evict runs not used for this many days
+STALE_TMP_SECONDS = 3600        # Remove half-written runs (.tmp-*) older than this
+
+# =============================================================================
+# KEYS AND COLUMNS
+# =============================================================================
+
+def run_key(config):
+    """
+    Stable hash of a session configuration (including the seed).
+    """
+    description = json.dumps({'config': config, 'version': STORE_VERSION}, sort_keys=True)
+    return hashlib.sha256(description.encode()).hexdigest()[:16]
+
+def stats_to_columns(frame_stats):
+    """
+    List of per-frame statistics dicts -> dict of column arrays.
+    """
+    if not frame_stats:
+        return {}
+    return {name: np.array([s[name] for s in frame_stats]) for name in frame_stats[0]}
+
+def columns_to_stats(columns):
+    """
+    Dict of column arrays -> list of per-frame statistics dicts.
+    """
+    names = list(columns)
+    rows = zip(*(columns[name].tolist() for name in names))
+    return [dict(zip(names, row)) for row in rows]
+
+# =============================================================================
+# SAVE / LOAD
+# =============================================================================
+
+def _dir_size(path):
+    return sum(os.path.getsize(os.path.join(root, f))
+               for root, _, files in os.walk(path) for f in files)
+
+def save_run(config, frame_stats, samples=None, frames=None, store_dir=RESULTS_DIR):
+    """
+    Writes a run to the store and returns its key. The run directory is
+    written under a temporary name and renamed, so readers never see a
+    half-written run; a failed save removes its temporary directory (one
+    left by a crashed process is swept by evict_runs).
+    """
+    key = run_key(config)
+    run_dir = os.path.join(store_dir, key)
+    tmp_dir = f"{run_dir}.tmp-{os.getpid()}"
+    os.makedirs(tmp_dir, exist_ok=True)
+    try:
+        _write_run(tmp_dir, key, config, frame_stats, samples, frames)
+    except BaseException:
+        shutil.rmtree(tmp_dir, ignore_errors=True)
+        raise
+
+    shutil.rmtree(run_dir, ignore_errors=True)
+    os.replace(tmp_dir, run_dir)
+    return key
+
+def _write_run(tmp_dir, key, config, frame_stats, samples, frames):
+    """
+    Writes the files of a run into its temporary directory.
+    """
+    with open(os.path.join(tmp_dir, 'config.json'), 'w') as f:
+        json.dump({'key': key, 'config': config, 'created': time.time(),
+                   'frames': len(frame_stats)}, f, indent=2)
+
+    columns = stats_to_columns(frame_stats)
+    if pa is not None:
+        pq.write_table(pa.table(columns), os.path.join(tmp_dir, 'stats.parquet'),
+                       compression='zstd')
+    else:
+        np.savez_compressed(os.path.join(tmp_dir, 'stats.npz'), **columns)
+
+    if samples is not None:
+        np.savez_compressed(os.path.join(tmp_dir, 'samples.npz'), samples=samples)
+
+    if frames is not None:
+        frames_dir = os.path.join(tmp_dir, 'frames')
+        os.makedirs(frames_dir)
+        for name, values in frames.items():
+            np.save(os.path.join(frames_dir, f'{name}.npy'), values)
+
+def load_run(config, store_dir=RESULTS_DIR):
+    """
+    Loads a stored run, or returns None if the configuration has not been run.
+    The result holds the key, the config, the statistics as columns and as a
+    list of per-frame dicts (also indexed by sample count), the samples and
+    the memory-mapped per-frame drawing data (None when not stored).
+    """
+    key = run_key(config)
+    run_dir = os.path.join(store_dir, key)
+    parquet_path = os.path.join(run_dir, 'stats.parquet')
+    npz_path = os.path.join(run_dir, 'stats.npz')
+
+    if os.path.exists(parquet_path) and pa is not None:
+        table = pq.read_table(parquet_path)
+        columns = {name: table.column(name).to_numpy() for name in table.column_names}
+    elif os.path.exists(npz_path):
+        with np.load(npz_path) as data:
+            columns = {name: data[name] for name in data.files}
+    else:
+        return None
+
+    samples = None
+    samples_path = os.path.join(run_dir, 'samples.npz')
+    if os.path.exists(samples_path):
+        with np.load(samples_path) as data:
+            samples = data['samples']
+
+    frames = None
+    frames_dir = os.path.join(run_dir, 'frames')
+    if os.path.isdir(frames_dir):
+        frames = {name[:-4]: np.load(os.path.join(frames_dir, name), mmap_mode='r')
+                  for name in os.listdir(frames_dir) if name.endswith('.npy')}
+
+    os.utime(run_dir)  # Mark as recently used for eviction
+    frame_stats = columns_to_stats(columns)
+    return {
+        'key': key,
+        'config': config,
+        'columns': columns,
+        'stats': frame_stats,
+        'stats_by_n': {s['n']: s for s in frame_stats},
+        'samples': samples,
+        'frames': frames,
+    }
+
+# =============================================================================
+# EVICTION
+# =============================================================================
+
+def evict_runs(store_dir=RESULTS_DIR, max_bytes=MAX_STORE_BYTES, max_age_days=MAX_AGE_DAYS,
+               keep=()):
+    """
+    Deletes half-written runs older than STALE_TMP_SECONDS (left by a
+    crashed save), runs unused for more than max_age_days, then the least
+    recently used runs until the store is below max_bytes. Keys in keep are
+    never evicted. Returns the evicted keys.
+    """
+    if not os.path.isdir(store_dir):
+        return []
+
+    runs = []
+    evicted = []
+    now = time.time()
+    for key in os.listdir(store_dir):
+        run_dir = os.path.join(store_dir, key)
+        if not os.path.isdir(run_dir):
+            continue
+        if '.tmp-' in key:
+            # Saves in progress are recent; older ones were interrupted
+            if now - os.path.getmtime(run_dir) > STALE_TMP_SECONDS:
+                shutil.rmtree(run_dir, ignore_errors=True)
+                evicted.append(key)
+        else:
+            runs.append((os.path.getmtime(run_dir), _dir_size(run_dir), key))
+    runs.sort()  # Least recently used first
+
+    total = sum(size for _, size, _ in runs)
+    for last_used, size, key in runs:
+        too_old = max_age_days is not None and now - last_used > max_age_days * 86400
+        too_big = max_bytes is not None and total > max_bytes
+        if (too_old or too_big) and key not in keep:
+            shutil.rmtree(os.path.join(store_dir, key), ignore_errors=True)
+            total -= size
+            evicted.append(key)
+    return evicted
+
+# =============================================================================
+# CACHED SESSIONS
+# =============================================================================
+
+def cached_session(config, keep_samples=False, keep_frames=False, store_dir=RESULTS_DIR):
+    """
+    Returns the stored run of a configuration, running and storing the
+    session first if it is not in the store (or lacks requested samples or
+    frame data).
+    The result has an extra 'cached' flag telling whether it was a store hit.
+    """
+    from gaussian_animation import run_session
+
+    run = load_run(config, store_dir)
+    keep_samples = keep_samples and config.get('quantile_backend', 'exact') == 'exact'
+    cached = (run is not None
+              and (run['samples'] is not None or not keep_samples)
+              and (run['frames'] is not None or not keep_frames))
+    if not cached:
+        # Keep whatever the previous run stored, so a replay does not drop samples
+        keep_samples = keep_samples or (run is not None and run['samples'] is not None)
+        keep_frames = keep_frames or (run is not None and run['frames'] is not None)
+        session = run_session(config, keep_samples=keep_samples, keep_frames=keep_frames)
+        save_run(config, session['stats'], session['samples'], session['frames'], store_dir)
+        run = load_run(config, store_dir)
+
+    evict_runs(store_dir, keep=(run['key'],))
+    run['cached'] = cached
+    return run
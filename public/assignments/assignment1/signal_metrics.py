@@ -0,0 +1,166 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab: Fused Signal Metrics Kernel
+=====================================
+
+Single-pass computation of the wireless metrics reported by the Gaussian
+animation: mean, variance, average and peak power, SNR, PAPR and the
+confidence interval of the mean. The signal is read once, in cache-sized
+chunks; the moments of the chunks are combined with Chan's parallel update,
+so there are no n-sized temporaries (no samples**2 arrays) and the variance
+does not suffer from the cancellation of the sum-of-squares formula.
+
+A 2-D input is treated as a batch of signals, one per row, and every metric
+is returned as an array with one value per row. dB values are NaN-safe: a
+ratio that is zero, negative or undefined (e.g. SNR of a zero-mean signal,
+or of a constant signal) gives NaN instead of ±inf and no warnings, and an
+empty signal gives NaN for every metric.
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+Assignment: 1 - Gaussian Random Variable Distribution (statistics)
+"""
+
+from functools import lru_cache
+
+import numpy as np
+import scipy.stats as stats
+
+# =============================================================================
+# CONFIGURATION
+# =============================================================================
+
+CHUNK_ELEMENTS = 2**16      # Elements processed per chunk (bounds the temporaries)
+CONFIDENCE_LEVEL = 0.95     # Confidence level of the interval on the mean
+
+# =============================================================================
+# HELPERS
+# =============================================================================
+
+@lru_cache(maxsize=4096)
+def t_critical(dof, confidence=CONFIDENCE_LEVEL):
+    """
+    Two-sided Student-t critical value, cached by degrees of freedom.
+    """
+    if dof < 1:
+        return float('nan')
+    return float(stats.t.ppf(0.5 + confidence / 2, dof))
+
+def to_db(ratio, scale=10):
+    """
+    scale·log10(ratio), NaN where the ratio is not a positive finite number.
+    """
+    ratio = np.asarray(ratio, dtype=np.float64)
+    valid = np.isfinite(ratio) & (ratio > 0)
+    db = np.full(ratio.shape, np.nan)
+    np.log10(ratio, out=db, where=valid)
+    db *= scale
+    return db if db.ndim else float(db)
+
+# =============================================================================
+# METRICS KERNEL
+# =============================================================================
+
+def signal_metrics(samples, confidence=CONFIDENCE_LEVEL, dtype=np.float64,
+                   chunk_elements=CHUNK_ELEMENTS):
+    """
+    Moments, power, SNR, PAPR and confidence interval of a signal (1-D) or of
+    every row of a batch of signals (2-D), in one chunked pass.
+    dtype is the working precision of the chunks (float32 halves the memory
+    traffic); the running totals are always float64.
+    Returns a dict of floats (1-D input) or of per-row arrays (2-D input).
+    """
+    samples = np.asarray(samples)
+    batch = samples.ndim == 2
+    rows = samples if batch else samples[None, :]
+    num_rows, n = rows.shape
+    step = max(1024, chunk_elements // max(num_rows, 1))
+
+    count = 0
+    mean = np.zeros(num_rows)
+    m2 = np.zeros(num_rows)
+    peak = np.zeros(num_rows)
+    for start in range(0, n, step):
+        chunk = np.asarray(rows[:, start:start + step], dtype=dtype)
+        size = chunk.shape[1]
+
+        # Chunk moments: one centred temporary of chunk size
+        chunk_mean = chunk.mean(axis=1, dtype=np.float64)
+        centred = chunk - chunk_mean[:, None].astype(dtype)
+        chunk_m2 = np.einsum('ij,ij->i', centred, centred, dtype=np.float64)
+        peak = np.maximum(peak, np.maximum(chunk.max(axis=1), -chunk.min(axis=1)).astype(np.float64))
+
+        # Chan's parallel update of the running mean and M2
+        total = count + size
+        delta = chunk_mean - mean
+        mean += delta * size / total
+        m2 += chunk_m2 + delta**2 * count * size / total
+        count = total
+
+    if not count:  # Empty signal: the mean and peak are undefined as well
+        mean = np.full(num_rows, np.nan)
+        peak = np.full(num_rows, np.nan)
+
+    with np.errstate(divide='ignore', invalid='ignore'):
+        var = m2 / (count - 1) if count > 1 else np.full(num_rows, np.nan)
+        std = np.sqrt(var)
+        avg_power = m2 / count + mean**2 if count else np.full(num_rows, np.nan)
+        peak_power = peak**2
+        margin_error = t_critical(count - 1, confidence) * std / np.sqrt(count)
+        snr_db = to_db(np.abs(mean) / std, 20)
+        papr_db = to_db(peak_power / avg_power, 10)
+
+    metrics = {
+        'n': count,
+        'emp_mean': mean,
+        'emp_var': var,
+        'emp_std': std,
+        'avg_power': avg_power,
+        'peak_power': peak_power,
+        'snr_db': snr_db,
+        'papr_db': papr_db,
+        'ci_lower': mean - margin_error,
+        'ci_upper': mean + margin_error,
+        'margin_error': margin_error,
+    }
+    if not batch:
+        metrics = {name: value if name == 'n' else float(np.asarray(value)[0])
+                   for name, value in metrics.items()}
+    return metrics
+
+# =============================================================================
+# DEMONSTRATION
+# =============================================================================
+
+if __name__ == "__main__":
+    import time
+
+    print("=" * 60)
+    print("WCOM Lab - Fused Signal Metrics Kernel")
+    print("=" * 60)
+
+    rng = np.random.default_rng(42)
+    signal = rng.normal(0.5, 1.0, 10_000_000)
+
+    t0 = time.perf_counter()
+    metrics = signal_metrics(signal)
+    t_kernel = time.perf_counter() - t0
+
+    t0 = time.perf_counter()
+    reference_var = np.var(signal, ddof=1)
+    reference_papr = 10 * np.log10(np.max(signal**2) / np.mean(signal**2))
+    t_reference = time.perf_counter() - t0
+
+    print(f"n = {metrics['n']:,}: kernel {t_kernel * 1e3:.0f} ms | "
+          f"NumPy with temporaries {t_reference * 1e3:.0f} ms")
+    print(f"Variance: {metrics['emp_var']:.6f} (NumPy {reference_var:.6f})")
+    print(f"PAPR:     {metrics['papr_db']:.4f} dB (NumPy {reference_papr:.4f} dB)")
+    print(f"95% CI of the mean: [{metrics['ci_lower']:.5f}, {metrics['ci_upper']:.5f}]")
+
+    # Batch of signals, one per row; the zero-mean row gets a NaN SNR
+    batch = rng.normal(0.0, 1.0, (4, 100_000))
+    batch[0] = 0.0
+    batch[1] += 1.0
+    batch_metrics = signal_metrics(batch, dtype=np.float32)
+    print(f"Batch SNR (dB):  {np.round(batch_metrics['snr_db'], 2)}")
+    print(f"Batch PAPR (dB): {np.round(batch_metrics['papr_db'], 2)}")
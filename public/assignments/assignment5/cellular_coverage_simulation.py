@@ -0,0 +1,270 @@
+# -*- coding: utf-8 -*-
+"""
+WCOM Lab Assignment 5: Large-Scale Cellular Coverage / SINR Simulation
+======================================================================
+
+Monte Carlo extension of cellular_network_analysis.m. Instead of 10 users in a
+single cell, 10^6+ users are dropped over a multi-cell hexagonal layout and the
+downlink SINR of every user is evaluated with log-distance path loss and
+log-normal shadowing. Site coordinates are precomputed once and a KD-tree finds
+the nearest (strongest candidate) cells of every user, so the per-user work is
+a handful of vectorized array operations.
+
+Author: WCOM Lab - LNMIIT
+Course: Wireless Communication Laboratory
+Assignment: 5 - Cellular Network Analysis (coverage / SINR)
+"""
+
+import os
+import sys
+
+import numpy as np
+import matplotlib.pyplot as plt
+from scipy.spatial import cKDTree
+
+# Reuse the Gaussian sampler and empirical CDF from Assignment 1
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'assignment1'))
+from gaussian_animation import generate_samples, empirical_cdf
+from gaussian_fields import ShadowingMap
+
+# =============================================================================
+# USER-CONFIGURABLE PARAMETERS
+# =============================================================================
+
+# Layout parameters
+R = 1000.0                  # Cell radius (m)
+num_tiers = 2               # Rings of cells around the centre site (2 -> 19 sites)
+N_users = 1_000_000         # Number of users dropped over the layout
+num_candidates = 7          # Nearest sites evaluated per user (serving + interferers)
+chunk_size = 250_000        # Users processed per vectorized block (bounds memory)
+random_seed = 42            # Random seed for reproducibility
+
+# RF parameters (same as cellular_network_analysis.m)
+fc = 20e9                   # Carrier frequency (Hz)
+c = 3e8                     # Speed of light (m/s)
+d0 = 1.0                    # Reference distance (m)
+Pt_dBm = 46.0               # Transmit power (dBm)
+Gt_dBi = 15.0               # Transmitter antenna gain (dBi)
+Gr_dBi = 0.0                # Receiver antenna gain (dBi)
+pl_exp = 3.5                # Path loss exponent
+sigma_db = 8.0              # Shadowing standard deviation (dB)
+shadowing_model = 'iid'     # 'iid' per link, or 'correlated' (Gudmundson map per site)
+d_corr = 50.0               # Shadowing decorrelation distance (m), 'correlated' only
+shadow_resolution = 10.0    # Shadowing map grid resolution (m), 'correlated' only
+
+# Noise parameters
+To = 240.0                  # Noise temperature (K)
+k_B = 1.38e-23              # Boltzmann constant (J/K)
+BW = 10e6                   # Bandwidth (Hz)
+
+# Coverage thresholds reported in the summary
+sinr_thresholds_db = [-5, 0, 5, 10, 20]
+
+# =============================================================================
+# LAYOUT
+# =============================================================================
+
+def hex_site_positions(num_tiers, R):
+    """
+    Returns the (x, y) coordinates of a hexagonal layout with num_tiers rings of
+    pointy-top cells of radius R around a centre site at the origin.
+    """
+    isd = np.sqrt(3) * R  # Inter-site distance
+    sites = []
+    for q in range(-num_tiers, num_tiers + 1):
+        for r in range(-num_tiers, num_tiers + 1):
+            if abs(q + r) <= num_tiers:
+                sites.append((isd * (q + r / 2), isd * np.sqrt(3) / 2 * r))
+    sites.sort(key=lambda p: p[0]**2 + p[1]**2)  # Centre site first
+    return np.array(sites)
+
+def drop_users(n, sites, R, rng):
+    """
+    Drops n users uniformly over the hexagonal cells of the layout.
+    Each user picks a cell at random and is placed uniformly inside its hexagon
+    by vectorized rejection sampling from the bounding box.
+    """
+    x = np.empty(n)
+    y = np.empty(n)
+    filled = 0
+    half_width = np.sqrt(3) / 2 * R
+    while filled < n:
+        m = int((n - filled) * 1.4) + 16  # Acceptance ratio is 3/4
+        px = rng.uniform(-half_width, half_width, m)
+        py = rng.uniform(-R, R, m)
+        inside = np.abs(py) <= R - np.abs(px) / np.sqrt(3)
+        px, py = px[inside], py[inside]
+        take = min(n - filled, len(px))
+        x[filled:filled + take] = px[:take]
+        y[filled:filled + take] = py[:take]
+        filled += take
+    cell = rng.integers(0, len(sites), n)
+    return np.column_stack((x + sites[cell, 0], y + sites[cell, 1]))
+
+# =============================================================================
+# LINK BUDGET
+# =============================================================================
+
+def log_distance_path_loss(d, fc, pl_exp, d0):
+    """
+    Log-distance path loss (dB) referenced to free space at d0.
+    """
+    PL_d0 = 20 * np.log10(4 * np.pi * d0 * fc / c)
+    return PL_d0 + 10 * pl_exp * np.log10(np.maximum(d, d0) / d0)
+
+def noise_power_dbm(To, BW):
+    """
+    Thermal noise power kTB in dBm.
+    """
+    return 10 * np.log10(k_B * To * BW) + 30
+
+def site_shadowing_maps(sites, rng):
+    """
+    One spatially correlated shadowing map per site, centred on the layout.
+    """
+    extent = np.abs(sites).max() + R
+    origin = (-extent, -extent)
+    seeds = rng.integers(0, 2**31, len(sites))
+    return [ShadowingMap(sigma_db=sigma_db, d_corr=d_corr, resolution=shadow_resolution,
+                         seed=int(seed), origin=origin) for seed in seeds]
+
+def simulate_sinr(users, site_tree, rng, shadow_maps=None):
+    """
+    Computes the downlink SINR (dB) of every user.
+    The num_candidates nearest sites of each user are looked up in the KD-tree;
+    every link gets its own shadowing value, the strongest link serves the user
+    and the remaining candidates interfere. Sites further away than the
+    candidates are neglected (their contribution is well below the noise floor
+    for pl_exp >= 3). Shadowing is i.i.d. per link unless per-site shadowing
+    maps are given, in which case it is read off the map at the user position.
+    """
+    n = len(users)
+    k = min(num_candidates, site_tree.n)
+    noise_mw = 10**(noise_power_dbm(To, BW) / 10)
+    sinr_db = np.empty(n)
+    serving = np.empty(n, dtype=np.int64)
+
+    for start in range(0, n, chunk_size):
+        stop = min(start + chunk_size, n)
+        dist, idx = site_tree.query(users[start:stop], k=k)
+        dist = dist.reshape(stop - start, k)
+        idx = idx.reshape(stop - start, k)
+
+        # Received power of every candidate link (dBm)
+        if shadow_maps is None:
+            shadowing = generate_samples((stop - start, k), 0.0, sigma_db, rng)
+        else:
+            # Links grouped by site with one sort; each map is read once per chunk
+            shadowing = np.empty((stop - start, k))
+            flat_idx, flat_shadowing = idx.ravel(), shadowing.reshape(-1)
+            order = np.argsort(flat_idx, kind='stable')
+            bounds = np.flatnonzero(np.diff(flat_idx[order])) + 1
+            for links in np.split(order, bounds):
+                pos = users[start + links // k]
+                flat_shadowing[links] = shadow_maps[flat_idx[links[0]]].lookup(pos[:, 0], pos[:, 1])
+        Pr_dBm = Pt_dBm + Gt_dBi + Gr_dBi - log_distance_path_loss(dist, fc, pl_exp, d0) - shadowing
+        Pr_mw = 10**(Pr_dBm / 10)
+
+        # Strongest link serves, all other candidates interfere
+        best = np.argmax(Pr_mw, axis=1)
+        rows = np.arange(stop - start)
+        signal_mw = Pr_mw[rows, best]
+        interference_mw = Pr_mw.sum(axis=1) - signal_mw
+
+        sinr_db[start:stop] = 10 * np.log10(signal_mw / (interference_mw + noise_mw))
+        serving[start:stop] = idx[rows, best]
+
+    return sinr_db, serving
+
+def coverage_probability(sinr_db, thresholds_db):
+    """
+    P(SINR > T) for every threshold T, read off the empirical CDF.
+    """
+    sorted_sinr, y_empirical = empirical_cdf(sinr_db)
+    pos = np.searchsorted(sorted_sinr, thresholds_db, side='right')
+    cdf = np.where(pos > 0, y_empirical[np.maximum(pos - 1, 0)], 0.0)
+    return 1 - cdf
+
+# =============================================================================
+# PLOTTING
+# =============================================================================
+
+def plot_coverage(sinr_db, rate_mbps, users, sites, max_points=20000):
+    """
+    Layout snapshot plus SINR and rate coverage CDFs.
+    """
+    fig, (ax_layout, ax_sinr, ax_rate) = plt.subplots(1, 3, figsize=(18, 5.5))
+    fig.suptitle('WCOM Lab Assignment 5: Multi-Cell Coverage Simulation\n' +
+                 f'{len(sites)} sites | {len(users):,} users | n={pl_exp}, σ={sigma_db} dB',
+                 fontsize=14, fontweight='bold')
+
+    # Layout (subsampled for readability)
+    step = max(1, len(users) // max_points)
+    sc = ax_layout.scatter(users[::step, 0], users[::step, 1], c=sinr_db[::step],
+                           s=1, cmap='viridis', vmin=-10, vmax=30)
+    ax_layout.plot(sites[:, 0], sites[:, 1], 'r^', markersize=8, label='Base Stations')
+    fig.colorbar(sc, ax=ax_layout, label='SINR (dB)')
+    ax_layout.set_aspect('equal')
+    ax_layout.set_title('User Drop (colored by SINR)', fontsize=12)
+    ax_layout.set_xlabel('X Position (m)')
+    ax_layout.set_ylabel('Y Position (m)')
+    ax_layout.legend(loc='upper right', fontsize=9)
+
+    # SINR coverage CDF
+    sorted_sinr, y_empirical = empirical_cdf(sinr_db)
+    ax_sinr.plot(sorted_sinr[::step], y_empirical[::step], 'b-', linewidth=2, label='Empirical CDF')
+    ax_sinr.set_title('SINR Distribution\n(Empirical CDF)', fontsize=12)
+    ax_sinr.set_xlabel('SINR (dB)')
+    ax_sinr.set_ylabel('Cumulative Probability')
+    ax_sinr.grid(True, alpha=0.3)
+    ax_sinr.legend(loc='lower right', fontsize=9)
+
+    # Rate CDF
+    sorted_rate, y_rate = empirical_cdf(rate_mbps)
+    ax_rate.plot(sorted_rate[::step], y_rate[::step], 'g-', linewidth=2, label='Empirical CDF')
+    ax_rate.set_title('Achievable Rate Distribution\n(Shannon Capacity)', fontsize=12)
+    ax_rate.set_xlabel('Rate (Mbps)')
+    ax_rate.set_ylabel('Cumulative Probability')
+    ax_rate.grid(True, alpha=0.3)
+    ax_rate.legend(loc='lower right', fontsize=9)
+
+    plt.tight_layout()
+    return fig
+
+# =============================================================================
+# MAIN SCRIPT
+# =============================================================================
+
+if __name__ == "__main__":
+    print("=" * 60)
+    print("WCOM Lab - Multi-Cell Coverage / SINR Simulation")
+    print("=" * 60)
+
+    rng = np.random.default_rng(random_seed)
+
+    # Precompute the layout and its spatial index once
+    sites = hex_site_positions(num_tiers, R)
+    site_tree = cKDTree(sites)
+    print(f"Sites: {len(sites)} ({num_tiers} tiers, ISD = {np.sqrt(3) * R:.0f} m)")
+
+    users = drop_users(N_users, sites, R, rng)
+    print(f"Users dropped: {N_users:,}")
+
+    shadow_maps = site_shadowing_maps(sites, rng) if shadowing_model == 'correlated' else None
+    print(f"Shadowing: {shadowing_model} (σ = {sigma_db} dB)")
+
+    sinr_db, serving = simulate_sinr(users, site_tree, rng, shadow_maps)
+    rate_mbps = BW * np.log2(1 + 10**(sinr_db / 10)) / 1e6
+
+    print("\n=== Coverage Results ===")
+    print(f"Noise power: {noise_power_dbm(To, BW):.1f} dBm")
+    print(f"Median SINR: {np.median(sinr_db):.2f} dB")
+    print(f"5th percentile SINR (cell edge): {np.percentile(sinr_db, 5):.2f} dB")
+    print(f"Average rate: {np.mean(rate_mbps):.2f} Mbps")
+    for T, p in zip(sinr_thresholds_db, coverage_probability(sinr_db, sinr_thresholds_db)):
+        print(f"P(SINR > {T:3d} dB): {p:.4f}")
+
+    plot_coverage(sinr_db, rate_mbps, users, sites)
+    plt.savefig('cellular_coverage_simulation.png', dpi=150)
+    print("\nPlot saved as cellular_coverage_simulation.png")
+    plt.show()